@@ -4,7 +4,7 @@ from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 from hypersave.database.models import Base
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,7 +26,7 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
-settings = Settings()
+settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
 
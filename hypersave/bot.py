@@ -1,23 +1,25 @@
 import asyncio
 import traceback
 
-import uvloop
 from convopyro import Conversation
 from pyrogram import Client, idle
 
 from hypersave.database.database import Database
 from hypersave.logger import logger
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 from hypersave.utils.clear_folders import clear_and_create_folders
 from hypersave.utils.directory_helper import ensure_directories_exist
 
-uvloop.install()
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 
 class ClientBot(Client):
 
     def __init__(self):
-        settings = Settings()
+        settings = get_settings()
         super().__init__(
             name=settings.bot_name,
             api_id=settings.api_id,
@@ -25,11 +27,15 @@ class ClientBot(Client):
             bot_token=settings.bot_token,
             plugins=dict(root="hypersave/plugins/"),
             workdir="./sessions/",
-            max_concurrent_transmissions=10,
+            max_concurrent_transmissions=settings.max_bot_concurrency,
         )
 
 
 async def main():
+    # Run the synchronous prefix of new tasks inline (download/upload workers
+    # often finish short steps without ever suspending)
+    asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     db = Database()
     db.create_tables()
     client = ClientBot()
@@ -43,7 +49,7 @@ if __name__ == "__main__":
         clear_and_create_folders()
         ensure_directories_exist()
         logger.success("Bot iniciado!")
-        asyncio.run(main())
+        (uvloop.run if uvloop else asyncio.run)(main())
     except Exception as e:
         logger.error(f"Erro ao iniciar o bot: {e}")
         traceback.print_exc()
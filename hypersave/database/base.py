@@ -18,4 +18,4 @@ class BaseRepository:
             raise
 
     def close(self):
-        self._session.close()
+        self.database.remove_session()
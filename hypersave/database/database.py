@@ -1,21 +1,34 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 
 
 class Database:
-    def __init__(self):
-        self._engine = create_engine(
-            settings.database_url,
-            pool_size=50,
-            max_overflow=30,
-            pool_recycle=1800,
-            pool_pre_ping=True,
-        )
-        self._Session = sessionmaker(bind=self._engine)
+    """Shared engine and session registry.
+
+    The engine (and its connection pool) is created once per process and
+    reused by every ``Database()`` instance, so repositories no longer open
+    their own pools.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            instance = super().__new__(cls)
+            instance._engine = create_engine(
+                settings.database_url,
+                pool_size=50,
+                max_overflow=30,
+                pool_recycle=1800,
+                pool_pre_ping=True,
+            )
+            instance._Session = scoped_session(sessionmaker(bind=instance._engine))
+            cls._instance = instance
+        return cls._instance
 
     def create_tables(self):
         from hypersave.database.base import BaseRepository
@@ -24,4 +37,7 @@ class Database:
         base_repository.metadata.create_all(self._engine)
 
     def get_session(self):
-        return self._Session()
+        return self._Session
+
+    def remove_session(self):
+        self._Session.remove()
@@ -11,6 +11,7 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 
 Base = declarative_base()
 
@@ -20,7 +21,8 @@ class User(Base):
     t_id = Column(BIGINT, primary_key=True)
     t_name = Column(String(100))
     t_username = Column(String(50), unique=True)
-    session_string = Column(Text)
+    # Only loaded on access, lookups by id rarely need the session blob
+    session_string = deferred(Column(Text))
     authorized = Column(Boolean, default=False)
 
     def __init__(self, t_id, t_name, t_username):
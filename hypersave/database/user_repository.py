@@ -1,7 +1,15 @@
+from functools import lru_cache
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
 from hypersave.database.base import BaseRepository
 from hypersave.database.models import User
 from hypersave.logger import logger
 
+# Rows fetched per round trip when streaming the users table
+USERS_YIELD_PER = 500
+
 
 class UserRepository(BaseRepository):
     def __init__(self):
@@ -9,38 +17,68 @@ class UserRepository(BaseRepository):
 
     def add(self, user):
         try:
-            self._session.merge(user)
+            stmt = insert(User).values(
+                t_id=user.t_id, t_name=user.t_name, t_username=user.t_username
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.t_id],
+                set_={
+                    "t_name": stmt.excluded.t_name,
+                    "t_username": stmt.excluded.t_username,
+                },
+            )
+            self._session.execute(stmt)
             self._session.commit()
             return True
         except Exception as e:
+            self._session.rollback()
             logger.error(f"Error adding user: {e}")
             return False
 
     def add_string_session(self, t_id, session_string):
         try:
-            user = self.get_by_id(t_id)
-            user.session_string = session_string
+            result = self._session.execute(
+                update(User)
+                .where(User.t_id == t_id)
+                .values(session_string=session_string)
+            )
             self._session.commit()
-            return True
+            return result.rowcount > 0
         except Exception as e:
+            self._session.rollback()
             logger.error(f"Error adding session string: {e}")
             return False
 
     def get_string_session(self, t_id):
         try:
-            user = self.get_by_id(t_id)
-            if not user:
-                return None
-            return user.session_string
+            return self._session.execute(
+                select(User.session_string).where(User.t_id == int(t_id))
+            ).scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting session string: {e}")
             return None
 
     def get_all(self):
+        """Iterate over all users, fetching rows in batches"""
         try:
-            return self._session.query(User).all()
+            return self._session.execute(
+                select(User).execution_options(yield_per=USERS_YIELD_PER)
+            ).scalars()
         except Exception as e:
             logger.error(f"Error getting all users: {e}")
+            return iter(())
+
+    def get_page(self, limit, offset=0):
+        try:
+            return (
+                self._session.execute(
+                    select(User).order_by(User.t_id).limit(limit).offset(offset)
+                )
+                .scalars()
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Error getting users page: {e}")
             return []
 
     def get_by_id(self, t_id):
@@ -49,3 +87,9 @@ class UserRepository(BaseRepository):
         except Exception as e:
             logger.error(f"Error getting user by id: {e}")
             return None
+
+
+@lru_cache(maxsize=1)
+def get_user_repository() -> UserRepository:
+    """Return the repository shared by all handlers and managers"""
+    return UserRepository()
@@ -13,7 +13,9 @@ FORMAT = (
 )
 
 
-logger.add(sys.stdout, format=FORMAT, level="DEBUG", colorize=True)
+# enqueue=True hands records to a background thread, so a slow stdout
+# consumer (Docker log driver, journald) never blocks the event loop
+logger.add(sys.stdout, format=FORMAT, level="DEBUG", colorize=True, enqueue=True)
 
 # logger.add(
 #     LOGS_DIR / "app.log",
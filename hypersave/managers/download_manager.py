@@ -1,34 +1,112 @@
 import asyncio
 import os
+import random
+import re
+import weakref
+from collections import deque
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from time import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+from time import monotonic, monotonic_ns, time, time_ns
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
 from pyrogram import Client
-from pyrogram.errors import PeerIdInvalid, RPCError
+from pyrogram.errors import FloodWait
 from pyrogram.types import Message
 
+from hypersave.logger import logger
 from hypersave.models.download_task import DownloadTask
-from hypersave.models.media_info import MediaInfo
-from hypersave.settings import Settings
+from hypersave.models.user_client import UserClient
+from hypersave.settings import get_settings
+from hypersave.utils.fair_queue import FairQueue
+from hypersave.utils.status_updater import StatusUpdater
+
+# Maximum concurrent downloads inside a single media group
+MEDIA_GROUP_CONCURRENCY = 5
+
+# Progress message, filled with str.format_map
+PROGRESS_TEMPLATE = (
+    "📥 Downloading: {percentage:.1f}%\n🚀 Speed: {speed}\n⏱️ ETA: {eta}"
+)
+
+# Speed units, indexed by the number of 10-bit shifts of the byte rate
+SPEED_UNITS = ("B/s", "KB/s", "MB/s")
+
+# Seconds a get_queue_status() snapshot is reused
+STATUS_CACHE_TTL = 1
+
+# Number of completed task ids kept for status reports
+COMPLETED_HISTORY_SIZE = 1000
+
+# Media attributes that carry a file_size, in lookup order
+MEDIA_KINDS = ("document", "video", "audio", "photo")
+
+# File extension for each media attribute, in lookup order
+MEDIA_EXTENSIONS = (
+    ("photo", ".jpg"),
+    ("video", ".mp4"),
+    ("audio", ".mp3"),
+    ("voice", ".ogg"),
+)
+
+# Download attempts and backoff bounds (seconds) for transient errors
+DOWNLOAD_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 8
+
+# Queued downloads allowed per concurrent download slot before new ones are refused
+QUEUE_SIZE_FACTOR = 8
+
+# Reply when the download queue has no room left
+QUEUE_FULL_TEXT = "⚠️ Download queue is full, please try again later."
+
+# Bytes of media group photos kept in memory until uploaded, photos beyond
+# this go to disk so a backed up upload queue can't exhaust memory
+MAX_IN_MEMORY_BYTES = 256 * 1024 * 1024
+
+# Seconds between progress message flushes
+PROGRESS_FLUSH_INTERVAL = 2
+
+# t.me/c/<chat_id>/[<topic_id>/]<message_id> or t.me/<channel_name>/<message_id>
+TELEGRAM_URL_RE = re.compile(
+    r"t\.me/(?:c/(\d+)/(?:(\d+)/)?(\d+)|(?!c/)([^/?#]+)/(\d+))"
+)
 
 
 class DownloadManager:
     def __init__(self, max_concurrent_downloads: int = 5):
-        self.settings = Settings()
+        self.settings = get_settings()
         self.MAX_FILE_SIZE = 2 * 1024 * 1024 * 1024  # 2GB limit
+        self.MAX_FILE_SIZE_STR = f"{self.MAX_FILE_SIZE / (1024 * 1024 * 1024):.2f}GB"
+        self._downloads_dir = os.fspath(self.settings.DOWNLOADS_DIR)
 
-        # Queue for downloads
-        self.download_queue = asyncio.Queue()
-        self.download_semaphore = asyncio.Semaphore(max_concurrent_downloads)
+        # Bounded queue for downloads, served round-robin between users
+        # (enqueue_download refuses new downloads when it is full)
+        self.download_queue = FairQueue(
+            maxsize=max_concurrent_downloads * QUEUE_SIZE_FACTOR
+        )
+        self.max_concurrent_downloads = max_concurrent_downloads
 
         # Track active and queued downloads
         self.active_downloads: Dict[str, DownloadTask] = {}  # task_id -> DownloadTask
-        self.completed_downloads: List[str] = []  # List of task_ids
+        self.completed_downloads: Deque[str] = deque(maxlen=COMPLETED_HISTORY_SIZE)
+
+        # Cached get_queue_status() snapshot and when it was built
+        self._status_cache = None
+        self._status_cache_time = 0.0
 
-        # Processor task
-        self.processor_task = None
+        # Single media downloads in progress ((chat_id, message_id) -> path future)
+        self._inflight_downloads: Dict[Tuple, asyncio.Future] = {}
+
+        # Latest progress not yet shown to the user (task_id -> DownloadTask)
+        self._pending_progress: Dict[str, DownloadTask] = {}
+
+        # Bytes held by in-memory photos that haven't been released yet
+        self._in_memory_bytes = 0
+
+        # Download workers and progress flusher task
+        self.workers: List[asyncio.Task] = []
+        self.progress_task = None
         self.running = False
 
         # Upload manager reference (will be set after initialization)
@@ -38,19 +116,24 @@ class DownloadManager:
         """Start the download manager processing loop"""
         if not self.running:
             self.running = True
-            self.processor_task = asyncio.create_task(self.process_download_queue())
+            self.workers = [
+                asyncio.create_task(self.process_download_queue())
+                for _ in range(self.max_concurrent_downloads)
+            ]
+            self.progress_task = asyncio.create_task(self._progress_flusher())
 
     async def stop(self):
         """Stop the download manager"""
         self.running = False
-        if self.processor_task:
-            self.processor_task.cancel()
-            try:
-                await self.processor_task
-            except asyncio.CancelledError:
-                pass
-
-    def parse_telegram_url(self, url: str) -> Tuple[str, int, Optional[int]]:
+        background_tasks = [t for t in (*self.workers, self.progress_task) if t]
+        for background_task in background_tasks:
+            background_task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        self.workers = []
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse_telegram_url(url: str) -> Tuple[str, int, Optional[int]]:
         """Parse Telegram URL to extract chat ID, message ID and optional topic/thread ID.
 
         Supports formats:
@@ -60,35 +143,33 @@ class DownloadManager:
         Returns (chat_id, message_id, message_thread_id)
         message_thread_id will be None when not present.
         """
-        parsed_url = urlparse(url)
-        path_parts = parsed_url.path.strip("/").split("/")
-
-        # Private channel/group URLs start with 'c'
-        if len(path_parts) >= 1 and path_parts[0] == "c":
-            # t.me/c/<chat_id>/<message_id>
-            # or t.me/c/<chat_id>/<topic_id>/<message_id>
-            if len(path_parts) >= 4:
-                chat_id = int("-100" + path_parts[1])
-                message_thread_id = int(path_parts[2])
-                message_id = int(path_parts[3])
-                return chat_id, message_id, message_thread_id
-            elif len(path_parts) >= 3:
-                chat_id = int("-100" + path_parts[1])
-                message_id = int(path_parts[2])
-                return chat_id, message_id, None
-            else:
-                raise ValueError("Invalid private Telegram URL format")
-        elif len(path_parts) >= 2:
-            # Public channel: t.me/channel_name/123
-            chat_id = path_parts[0]
-            message_id = int(path_parts[1])
-            return chat_id, message_id, None
-        else:
+        match = TELEGRAM_URL_RE.search(url)
+        if not match:
             raise ValueError("Invalid Telegram URL format")
 
+        private_id, topic_id, private_message_id, channel_name, public_message_id = (
+            match.groups()
+        )
+
+        if private_id:
+            # Private channel/group: t.me/c/<chat_id>[/<topic_id>]/<message_id>
+            return (
+                int("-100" + private_id),
+                int(private_message_id),
+                int(topic_id) if topic_id else None,
+            )
+
+        # Public channel: t.me/channel_name/123
+        return channel_name, int(public_message_id), None
+
     async def enqueue_download(
-        self, user_client: Client, user_id: str, url: str, message: Message, bot: Client
-    ) -> str:
+        self,
+        user_client: UserClient,
+        user_id: str,
+        url: str,
+        message: Message,
+        bot: Client,
+    ) -> Optional[str]:
         """
         Add a download task to the queue
 
@@ -100,17 +181,25 @@ class DownloadManager:
             bot: Bot client for sending responses
 
         Returns:
-            task_id: Unique identifier for this download task
+            task_id: Unique identifier for this download task, None if the
+            queue is full
         """
         try:
             # Parse chat_id, message_id and optional thread id from URL
             chat_id, message_id, message_thread_id = self.parse_telegram_url(url)
 
             # Create a unique task ID
-            task_id = f"{user_id}_{chat_id}_{message_id}_{int(time())}"
+            task_id = f"{user_id}_{chat_id}_{message_id}_{time_ns()}"
 
-            # Create status message
-            status_message = await message.reply("⏳ Download added to queue...")
+            # Don't block the update handler waiting for room in the queue
+            if self.download_queue.full():
+                await message.reply(QUEUE_FULL_TEXT)
+                return None
+
+            # Create status message with the queue position
+            position = self.download_queue.next_position(user_id)
+            queue_text = f"🔄 Download queued. Position: {position}"
+            status_message = await message.reply(queue_text)
 
             # Create download task
             task = DownloadTask(
@@ -131,16 +220,19 @@ class DownloadManager:
             )
 
             # Store last progress text to avoid duplicate updates
-            task.last_progress_text = "⏳ Download added to queue..."
+            task.last_progress_text = queue_text
 
-            # Put task in queue
-            await self.download_queue.put(task)
+            # Keep the user client alive until the task is done
+            user_client.acquire()
 
-            # Update status message
-            queue_text = f"🔄 Download queued. Position: {self.download_queue.qsize()}"
-            if queue_text != task.last_progress_text:
-                await status_message.edit_text(queue_text)
-                task.last_progress_text = queue_text
+            # Put task in queue, it may have filled up while replying
+            try:
+                self.download_queue.put_nowait(task)
+            except asyncio.QueueFull:
+                user_client.release()
+                await self._edit_status(task, QUEUE_FULL_TEXT)
+                return None
+            self._status_cache = None
 
             return task_id
 
@@ -149,107 +241,108 @@ class DownloadManager:
             raise
 
     async def process_download_queue(self):
-        """Process the download queue in the background"""
+        """Download worker: process queued tasks one at a time
+
+        max_concurrent_downloads of these run in parallel, which is what
+        limits the number of concurrent downloads.
+        """
         while self.running:
             try:
                 # Get next task
                 task = await self.download_queue.get()
+            except asyncio.CancelledError:
+                break
 
-                # Process with semaphore to limit concurrent downloads
-                asyncio.create_task(self.process_download_task(task))
-
+            try:
+                await self.process_download_task(task)
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                print(f"Error in download queue processor: {e}")
+            except Exception:
+                logger.exception("Error in download queue processor")
+            finally:
+                # Mark queue task as done
+                self.download_queue.task_done()
 
     async def process_download_task(self, task: DownloadTask):
         """Process a single download task"""
-        async with self.download_semaphore:
-            try:
-                # Update task as active
-                self.active_downloads[task.task_id] = task
+        try:
+            # Update task as active
+            self.active_downloads[task.task_id] = task
 
-                # Update status message
-                await task.status_message.edit_text("📥 Download started...")
+            # Update status message
+            await self._edit_status(task, "📥 Download started...")
 
-                # Mark download start time
-                task.start_time = time()
+            # Mark download start time
+            task.start_time = time()
+            task.start_ns = monotonic_ns()
 
-                # Fetch the source message
-                # Note: For forum topics, Pyrogram's get_messages works without extra params.
-                # The topic_id in the URL is used to construct the correct chat/message reference,
-                # but get_messages() only needs chat_id and message_id.
-                source_message = await task.user_client.get_messages(
-                    task.chat_id, task.message_id
-                )
+            # Fetch the source message
+            # Note: For forum topics, Pyrogram's get_messages works without extra params.
+            # The topic_id in the URL is used to construct the correct chat/message reference,
+            # but get_messages() only needs chat_id and message_id.
+            source_message = await task.user_client.get_messages(
+                task.chat_id, task.message_id
+            )
 
-                if source_message.media_group_id:
-                    # Handle media group - vamos preservar informação de grupo
-                    output_files = await self._download_media_group(
-                        task, source_message
-                    )
+            if source_message.media_group_id:
+                # Handle media group - vamos preservar informação de grupo
+                output_files = await self._download_media_group(task, source_message)
 
-                    # Adicionar metadado de grupo na task para o upload_manager saber que é um grupo
-                    task.is_media_group = True
-                    task.media_group_id = source_message.media_group_id
-                else:
-                    # Handle single media
-                    output_file = await self._download_single_media(
-                        task, source_message
+                # Adicionar metadado de grupo na task para o upload_manager saber que é um grupo
+                task.is_media_group = True
+                task.media_group_id = source_message.media_group_id
+            else:
+                # Handle single media
+                output_file = await self._download_single_media(task, source_message)
+                output_files = [output_file] if output_file else []
+                task.is_media_group = False
+                task.media_group_id = None
+
+            # Mark download as completed
+            task.is_completed = True
+            self.completed_downloads.append(task.task_id)
+
+            # Queue for upload if we have files and upload manager is set
+            # (the download helpers only return files they just wrote)
+            if output_files and self.upload_manager:
+                if task.is_media_group:
+                    # Se for um grupo de mídia, envia todos os arquivos juntos para preservar agrupamento
+                    await self.upload_manager.enqueue_media_group(
+                        task.bot,
+                        task.user_id,
+                        output_files,
+                        source_message.media_group_id,
+                        task.original_message,
+                        task.status_message,
+                        task.media_captions,  # Passar as legendas capturadas
                     )
-                    output_files = [output_file] if output_file else []
-                    task.is_media_group = False
-                    task.media_group_id = None
-
-                # Mark download as completed
-                task.is_completed = True
-                self.completed_downloads.append(task.task_id)
-
-                # Queue for upload if we have files and upload manager is set
-                if output_files and self.upload_manager:
-                    if task.is_media_group:
-                        # Se for um grupo de mídia, envia todos os arquivos juntos para preservar agrupamento
-                        valid_files = [
-                            path
-                            for path in output_files
-                            if path and os.path.exists(path)
-                        ]
-                        if valid_files:
-                            await self.upload_manager.enqueue_media_group(
-                                task.bot,
-                                task.user_id,
-                                valid_files,
-                                source_message.media_group_id,
-                                task.original_message,
-                                task.status_message,
-                                task.media_captions,  # Passar as legendas capturadas
-                            )
-                    else:
-                        # Uploads individuais para mídias não agrupadas
-                        for output_path in output_files:
-                            if output_path and os.path.exists(output_path):
-                                # Add to upload queue
-                                await self.upload_manager.enqueue_upload(
-                                    task.bot,
-                                    task.user_id,
-                                    output_path,
-                                    source_message,
-                                    task.original_message,
-                                    task.status_message,
-                                )
+                else:
+                    # Uploads individuais para mídias não agrupadas
+                    for output_path in output_files:
+                        # Add to upload queue
+                        await self.upload_manager.enqueue_upload(
+                            task.bot,
+                            task.user_id,
+                            output_path,
+                            source_message,
+                            task.original_message,
+                            task.status_message,
+                        )
 
-            except Exception as e:
-                # Update status with error
-                await task.status_message.edit_text(f"❌ Download failed: {str(e)}")
-                print(f"Error processing download task: {e}")
-            finally:
-                # Remove from active downloads if still there
-                if task.task_id in self.active_downloads:
-                    del self.active_downloads[task.task_id]
+        except Exception as e:
+            # Update status with error
+            await self._edit_status(task, f"❌ Download failed: {str(e)}")
+            logger.exception("Error processing download task {}", task.task_id)
+        finally:
+            # The user client may be stopped again once no task uses it
+            task.user_client.release()
 
-                # Mark queue task as done
-                self.download_queue.task_done()
+            # Drop any progress update that was not flushed yet
+            self._pending_progress.pop(task.task_id, None)
+
+            # Remove from active downloads if still there
+            self.active_downloads.pop(task.task_id, None)
+            self._status_cache = None
 
     async def _download_single_media(
         self, task: DownloadTask, source_message: Message
@@ -260,231 +353,370 @@ class DownloadManager:
                 if source_message.text:
                     # Just text message, no download needed
                     await task.original_message.reply(source_message.text)
-                    await task.status_message.edit_text(
-                        "✅ Text message processed (no media)"
+                    await self._edit_status(
+                        task, "✅ Text message processed (no media)"
                     )
                 else:
-                    await task.status_message.edit_text(
-                        "❌ No media or text found in the message"
+                    await self._edit_status(
+                        task, "❌ No media or text found in the message"
                     )
                 return None
 
             # Get file size if available
-            file_size = 0
-            if hasattr(source_message, "document") and source_message.document:
-                file_size = source_message.document.file_size
-            elif hasattr(source_message, "video") and source_message.video:
-                file_size = source_message.video.file_size
-            elif hasattr(source_message, "audio") and source_message.audio:
-                file_size = source_message.audio.file_size
+            media = getattr(source_message, self._get_media_type(source_message), None)
+            file_size = getattr(media, "file_size", 0) or 0
 
             # Set total size in the task
             task.total_size = file_size
 
             # Check size limit
             if file_size > self.MAX_FILE_SIZE:
-                size_gb = self.MAX_FILE_SIZE / (1024 * 1024 * 1024)
-                await task.status_message.edit_text(
-                    f"❌ File exceeds {size_gb:.2f}GB limit and cannot be downloaded."
+                await self._edit_status(
+                    task,
+                    f"❌ File exceeds {self.MAX_FILE_SIZE_STR} limit and cannot be downloaded.",
                 )
                 return None
 
             # Determine file extension based on media type
             file_ext = self._get_file_extension(source_message)
 
-            # Create output path
-            output_path = (
-                self.settings.DOWNLOADS_DIR
-                / f"{task.chat_id}_{task.message_id}{file_ext}"
-            )
+            # Each task downloads to its own file, so a later request for
+            # the same message never writes to or cleans up a file that
+            # another task is still uploading
+            output_path = self.settings.DOWNLOADS_DIR / f"{task.task_id}{file_ext}"
+
+            # Reuse the file when the same message is already being downloaded
+            key = (task.chat_id, task.message_id)
+            inflight = self._inflight_downloads.get(key)
+            if inflight:
+                await self._edit_status(
+                    task, "⏳ Same file is already downloading, waiting for it..."
+                )
+                shared_path = await asyncio.shield(inflight)
+                if shared_path:
+                    linked_path = await self._share_download(
+                        task, shared_path, output_path
+                    )
+                    if linked_path:
+                        return linked_path
+
+                # The other download failed or can't be linked, fetch the
+                # file ourselves
+                return await self._download_file(task, source_message, output_path)
 
-            # Download media file with progress tracking and melhor tratamento de erros
+            inflight = asyncio.get_running_loop().create_future()
+            self._inflight_downloads[key] = inflight
             try:
+                file_path = await self._download_file(task, source_message, output_path)
+                inflight.set_result(file_path)
+                return file_path
+            finally:
+                if not inflight.done():
+                    inflight.set_result(None)
+                del self._inflight_downloads[key]
+
+        except Exception as e:
+            error_msg = f"❌ Download failed: {str(e)}"
+            logger.error("Download failed: {}", e)
+            await self._edit_status(task, error_msg)
+            raise
+
+    async def _download_file(
+        self, task: DownloadTask, source_message: Message, output_path: Path
+    ) -> Path:
+        """Download the media of a message to output_path
+
+        Failed attempts (Pyrogram returning no file, file system glitches,
+        FloodWait) are retried with exponential backoff and jitter.
+        """
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            try:
+                # Download media file with progress tracking
                 file_path = await source_message.download(
                     file_name=str(output_path),
                     progress=self._progress_callback,
                     progress_args=(task,),
                 )
-
-                # Update task with result
-                task.output_path = Path(file_path)
-
-                # Update status
-                await task.status_message.edit_text(
-                    "✅ Download completed. Queued for upload..."
+                # Pyrogram handles network and API errors itself and
+                # returns None instead of raising
+                if file_path is not None:
+                    break
+                error = RuntimeError("No file downloaded")
+            except (OSError, FloodWait) as e:
+                error = e
+
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise error
+
+            if isinstance(error, FloodWait):
+                delay = error.value
+            else:
+                delay = random.uniform(
+                    0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
                 )
+            logger.warning(
+                "Download attempt {}/{} failed, retrying in {:.1f}s: {}",
+                attempt,
+                DOWNLOAD_ATTEMPTS,
+                delay,
+                error,
+            )
+            await asyncio.sleep(delay)
 
-                return Path(file_path)
+        file_path = Path(file_path)
 
-            except FileNotFoundError as e:
-                # Problemas comuns no Docker com arquivos temporários
-                error_msg = (
-                    f"Erro ao salvar arquivo. Tentando novamente com novo nome: {e}"
-                )
-                print(error_msg)
+        # Don't let a late progress flush overwrite the final status
+        self._pending_progress.pop(task.task_id, None)
 
-                # Tentar com novo nome para evitar conflitos
-                new_output_path = output_path.with_name(
-                    f"{output_path.stem}_retry{output_path.suffix}"
-                )
+        # Update task with result
+        task.output_path = file_path
 
-                try:
-                    # Tentar novamente com novo nome
-                    file_path = await source_message.download(
-                        file_name=str(new_output_path)
-                    )
+        # Update status
+        await self._edit_status(task, "✅ Download completed. Queued for upload...")
 
-                    task.output_path = Path(file_path)
-                    await task.status_message.edit_text(
-                        "✅ Download completed após retentativa. Queued for upload..."
-                    )
+        return file_path
 
-                    return Path(file_path)
-                except Exception as retry_error:
-                    await task.status_message.edit_text(
-                        f"❌ Falha no download após retentativa: {str(retry_error)}"
-                    )
-                    raise
+    async def _share_download(
+        self, task: DownloadTask, shared_path: Path, output_path: Path
+    ) -> Optional[Path]:
+        """Hard link a file downloaded by another task to this task's path
 
-        except Exception as e:
-            error_msg = f"❌ Download failed: {str(e)}"
-            print(error_msg)
-            try:
-                await task.status_message.edit_text(error_msg)
-            except Exception as msg_error:
-                if "MESSAGE_NOT_MODIFIED" not in str(msg_error):
-                    print(f"Erro ao atualizar mensagem de erro: {msg_error}")
-            raise
+        The link is made before the first await, so the upload cleanup of
+        the other task can't remove the file first. Returns None if the
+        file can't be linked (already removed or no hard link support).
+        """
+        try:
+            os.link(shared_path, output_path)
+        except OSError as e:
+            logger.warning("Can't link shared download {}: {}", shared_path, e)
+            return None
+
+        task.output_path = output_path
+        await self._edit_status(task, "✅ Download completed. Queued for upload...")
+        return output_path
 
     async def _download_media_group(
         self, task: DownloadTask, source_message: Message
-    ) -> List[Path]:
-        """Download a media group (multiple photos/videos)"""
+    ) -> List[Union[Path, BytesIO]]:
+        """Download a media group (multiple photos/videos)
+
+        Photos are returned as in-memory buffers, everything else as paths.
+        """
         try:
             # Get all messages in the media group
             media_group_messages = await task.user_client.get_media_group(
                 task.chat_id, task.message_id
             )
 
-            output_paths = []
-            captions = []  # Lista para armazenar legendas
-
             # Update status message and track last text
             status_text = (
                 f"📥 Downloading media group ({len(media_group_messages)} items)..."
             )
-            if (
-                not hasattr(task, "last_progress_text")
-                or task.last_progress_text != status_text
-            ):
-                await task.status_message.edit_text(status_text)
-                task.last_progress_text = status_text
-
-            # Download each media in the group
-            for i, msg in enumerate(media_group_messages):
-                if not msg.media:
-                    continue
+            await self._edit_status(task, status_text)
 
-                # Armazenar a legenda deste item
-                captions.append(msg.caption or "")
+            media_messages = [msg for msg in media_group_messages if msg.media]
 
-                # Update progress with careful tracking of last message
-                new_status = (
-                    f"📥 Downloading media {i+1}/{len(media_group_messages)}..."
-                )
-                if task.last_progress_text != new_status:
-                    try:
-                        await task.status_message.edit_text(new_status)
-                        task.last_progress_text = new_status
-                    except Exception as e:
-                        if "MESSAGE_NOT_MODIFIED" not in str(e):
-                            print(f"Error updating status: {e}")
+            # Items finish concurrently, coalesce their counter edits so they
+            # don't arrive in bursts or out of order
+            status = StatusUpdater(task.status_message, task.last_progress_text)
+
+            completed = 0
+            group_semaphore = asyncio.Semaphore(MEDIA_GROUP_CONCURRENCY)
+
+            async def download_item(msg: Message) -> Union[Path, BytesIO]:
+                nonlocal completed
 
                 # Get file extension
                 file_ext = self._get_file_extension(msg)
 
-                # Create unique filename
-                output_path = (
-                    self.settings.DOWNLOADS_DIR / f"{task.chat_id}_{msg.id}{file_ext}"
+                # Create unique filename (per task, so two requests for the
+                # same album don't share files)
+                file_name = f"{task.task_id}_{msg.id}{file_ext}"
+
+                async with group_semaphore:
+                    # Photos need no processing before upload, so keep them
+                    # in memory instead of writing them to disk and reading
+                    # back, as long as the in-memory budget allows
+                    size = (msg.photo.file_size or 0) if msg.photo else 0
+                    in_memory = (
+                        msg.photo is not None
+                        and self._in_memory_bytes + size <= MAX_IN_MEMORY_BYTES
+                    )
+                    if in_memory:
+                        self._in_memory_bytes += size
+
+                    try:
+                        if in_memory:
+                            result = await msg.download(
+                                file_name=file_name, in_memory=True
+                            )
+                        else:
+                            # Download the file
+                            result = await msg.download(
+                                file_name=os.path.join(self._downloads_dir, file_name)
+                            )
+                    except BaseException:
+                        if in_memory:
+                            self._release_memory(size)
+                        raise
+
+                if in_memory:
+                    if isinstance(result, BytesIO):
+                        # Give the bytes back once the upload drops the buffer
+                        weakref.finalize(result, self._release_memory, size)
+                    else:
+                        self._release_memory(size)
+
+                # Pyrogram returns None when the download failed, fail this
+                # item only
+                if result is None:
+                    raise RuntimeError(f"No file downloaded for message {msg.id}")
+                if not isinstance(result, BytesIO):
+                    result = Path(result)
+
+                # Update progress with careful tracking of last message
+                completed += 1
+                status.set(
+                    f"📥 Downloaded media {completed}/{len(media_group_messages)}..."
                 )
 
-                # Download the file
-                file_path = await msg.download(file_name=str(output_path))
+                return result
 
-                output_paths.append(Path(file_path))
+            # Download all items concurrently, bounded by the group semaphore
+            download_tasks = [
+                asyncio.create_task(download_item(msg)) for msg in media_messages
+            ]
 
-            # Armazenar legendas na task
-            task.media_captions = captions
+            # Armazenar a legenda de cada item enquanto os downloads rodam
+            captions = [msg.caption or "" for msg in media_messages]
+
+            results = await asyncio.gather(*download_tasks, return_exceptions=True)
+
+            # Let the last counter edit land before the final status
+            await status.flush()
+            task.last_progress_text = status.last_text
+
+            # Keep the items that downloaded, a failed item doesn't sink the album
+            output_paths = []
+            task.media_captions = []
+            for msg, caption, result in zip(media_messages, captions, results):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, BaseException):
+                    logger.error(
+                        "Error downloading media group item {}: {}", msg.id, result
+                    )
+                    continue
+                output_paths.append(result)
+                task.media_captions.append(caption)
+
+            if not output_paths and media_messages:
+                raise next(r for r in results if isinstance(r, BaseException))
 
             # Update status with final message
             final_status = f"✅ Media group download completed ({len(output_paths)}/{len(media_group_messages)} files). Queued for upload..."
-            if task.last_progress_text != final_status:
-                try:
-                    await task.status_message.edit_text(final_status)
-                    task.last_progress_text = final_status
-                except Exception as e:
-                    if "MESSAGE_NOT_MODIFIED" not in str(e):
-                        print(f"Error updating final status: {e}")
+            await self._edit_status(task, final_status)
 
             return output_paths
 
         except Exception as e:
-            await task.status_message.edit_text(
-                f"❌ Media group download failed: {str(e)}"
-            )
+            await self._edit_status(task, f"❌ Media group download failed: {str(e)}")
             raise
 
+    def _release_memory(self, size: int):
+        """Return bytes of an in-memory photo to the budget"""
+        self._in_memory_bytes -= size
+
+    async def _edit_status(self, task: DownloadTask, text: str):
+        """Show text in the task's status message, skipping it if already shown"""
+        if text == task.last_progress_text:
+            return
+
+        try:
+            await task.status_message.edit_text(text)
+            task.last_progress_text = text
+        except Exception as e:
+            if "MESSAGE_NOT_MODIFIED" not in str(e):
+                logger.error("Error updating status message: {}", e)
+
     async def _progress_callback(self, current: int, total: int, task: DownloadTask):
-        """Callback for download progress updates"""
+        """Callback for download progress updates
+
+        Only records the latest state; the status message is edited by
+        _progress_flusher so a transfer never waits on Telegram.
+        """
         if total == 0:
             return
 
         # Update task progress
         task.progress = current
-        task.total_size = total
+        if task.total_size != total:
+            task.total_size = total
+        self._pending_progress[task.task_id] = task
+
+    async def _progress_flusher(self):
+        """Periodically show the latest progress of every active download"""
+        while self.running:
+            try:
+                await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+
+                pending = self._pending_progress
+                self._pending_progress = {}
+
+                # Edit concurrently, a slow or rate limited edit doesn't hold
+                # back the others
+                await asyncio.gather(
+                    *(self._edit_progress(task) for task in pending.values()),
+                    return_exceptions=True,
+                )
+
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Error in progress flusher")
+
+    async def _edit_progress(self, task: DownloadTask):
+        """Edit the status message of a task with its current progress"""
+        current = task.progress
+        total = task.total_size
 
         # Calculate percentage and speed
         percentage = current * 100 / total
-        elapsed_time = time() - task.start_time
-        speed = current / elapsed_time if elapsed_time > 0 else 0
+        elapsed_ns = monotonic_ns() - task.start_ns
+        speed = current * 1_000_000_000 // elapsed_ns if elapsed_ns > 0 else 0
 
         # Calculate ETA
         if speed > 0:
-            eta = (total - current) / speed
+            eta = (total - current) // speed
             eta_str = self._format_time(eta)
         else:
             eta_str = "∞"
 
         # Format speed string
-        if speed < 1024:
-            speed_str = f"{speed:.2f} B/s"
-        elif speed < 1024 * 1024:
-            speed_str = f"{speed/1024:.2f} KB/s"
-        else:
-            speed_str = f"{speed/(1024*1024):.2f} MB/s"
-
-        # Store previous progress info to avoid duplicate updates
-        if not hasattr(task, "last_progress_text"):
-            task.last_progress_text = ""
+        speed_str = self._format_speed(speed)
 
         # Prepare new progress text
-        new_progress_text = (
-            f"📥 Downloading: {percentage:.1f}%\n"
-            f"🚀 Speed: {speed_str}\n"
-            f"⏱️ ETA: {eta_str}"
+        new_progress_text = PROGRESS_TEMPLATE.format_map(
+            {"percentage": percentage, "speed": speed_str, "eta": eta_str}
         )
 
-        # Only update if the text actually changed or at 100%
-        if new_progress_text != task.last_progress_text or current == total:
-            # Update status periodically (not too often to avoid flood)
-            if current == total or current % (max(1, total // 10)) == 0:
-                try:
-                    await task.status_message.edit_text(new_progress_text)
-                    task.last_progress_text = new_progress_text
-                except Exception as e:
-                    # Ignore MESSAGE_NOT_MODIFIED errors
-                    if "MESSAGE_NOT_MODIFIED" not in str(e):
-                        print(f"Error updating progress: {e}")
+        # Only update if the text actually changed
+        if new_progress_text != task.last_progress_text:
+            try:
+                await task.status_message.edit_text(new_progress_text)
+                task.last_progress_text = new_progress_text
+            except Exception as e:
+                # Ignore MESSAGE_NOT_MODIFIED and FloodWait errors, the next
+                # flush will carry the latest progress anyway
+                if "MESSAGE_NOT_MODIFIED" not in str(e) and not isinstance(
+                    e, FloodWait
+                ):
+                    logger.error("Error updating progress: {}", e)
+
+    def _format_speed(self, speed: float) -> str:
+        """Format bytes per second into readable speed string"""
+        unit = min(max(int(speed).bit_length() - 1, 0) // 10, len(SPEED_UNITS) - 1)
+        return f"{speed / (1 << (10 * unit)):.2f} {SPEED_UNITS[unit]}"
 
     def _format_time(self, seconds: float) -> str:
         """Format seconds into readable time string"""
@@ -495,82 +727,81 @@ class DownloadManager:
         else:
             return f"{seconds//3600:.0f}h {(seconds%3600)//60:.0f}m"
 
+    def _get_media_type(self, message: Message) -> str:
+        """Return the name of the first media attribute set on the message"""
+        return next((kind for kind in MEDIA_KINDS if getattr(message, kind, None)), "")
+
     def _get_file_extension(self, message: Message) -> str:
         """Determine file extension based on media type"""
-        if message.photo:
-            return ".jpg"
-        elif message.video:
-            return ".mp4"
-        elif message.audio:
-            return ".mp3"
-        elif message.voice:
-            return ".ogg"
-        elif message.document:
-            # Try to get original extension if available
-            if message.document.file_name:
-                return Path(message.document.file_name).suffix
+        for attr, ext in MEDIA_EXTENSIONS:
+            if getattr(message, attr, None):
+                return ext
+
+        # Try to get original extension if available
+        if message.document and message.document.file_name:
+            return os.path.splitext(message.document.file_name)[1]
 
         # Default extension for other types
         return ".file"
 
     def get_queue_status(self) -> Dict[str, Any]:
-        """Get current status of download queue"""
+        """Get current status of download queue
+
+        The snapshot is reused for STATUS_CACHE_TTL seconds unless a task
+        was queued or finished in the meantime.
+        """
+        now = monotonic()
+        if (
+            self._status_cache is None
+            or now - self._status_cache_time >= STATUS_CACHE_TTL
+        ):
+            self._status_cache = self._build_queue_status()
+            self._status_cache_time = now
+        return self._status_cache
+
+    def _build_queue_status(self) -> Dict[str, Any]:
+        """Build a status snapshot of the download queue"""
         return {
             "queue_size": self.download_queue.qsize(),
             "active_downloads": len(self.active_downloads),
             "active_tasks": [
-                {
-                    "task_id": task_id,
-                    "user_id": task.user_id,
-                    "progress": (
-                        f"{(task.progress / task.total_size * 100):.1f}%"
-                        if task.total_size
-                        else "0%"
-                    ),
-                    "speed": self._calculate_speed(task) if task.start_time else "N/A",
-                    "eta": (
-                        self._calculate_eta(task)
-                        if task.start_time and task.total_size and task.progress
-                        else "N/A"
-                    ),
-                }
+                self._task_status(task_id, task)
                 for task_id, task in self.active_downloads.items()
             ],
             "completed_tasks": len(self.completed_downloads),
         }
 
-    def _calculate_speed(self, task: DownloadTask) -> str:
-        """Calculate current download speed for a task"""
+    def _task_status(self, task_id: str, task: DownloadTask) -> Dict[str, Any]:
+        """Status entry of an active task"""
+        speed, eta = self._calculate_speed_and_eta(task)
+        return {
+            "task_id": task_id,
+            "user_id": task.user_id,
+            "progress": (
+                f"{(task.progress / task.total_size * 100):.1f}%"
+                if task.total_size
+                else "0%"
+            ),
+            "speed": speed,
+            "eta": eta,
+        }
+
+    def _calculate_speed_and_eta(self, task: DownloadTask) -> Tuple[str, str]:
+        """Current download speed and ETA for a task, from one speed sample"""
         if not task.start_time:
-            return "N/A"
+            return "N/A", "N/A"
 
-        elapsed_time = time() - task.start_time
-        if elapsed_time <= 0 or task.progress <= 0:
-            return "0 B/s"
+        elapsed_ns = monotonic_ns() - task.start_ns
+        if elapsed_ns <= 0 or task.progress <= 0:
+            return "0 B/s", "N/A"
 
-        speed = task.progress / elapsed_time
+        speed = task.progress * 1_000_000_000 // elapsed_ns
 
-        if speed < 1024:
-            return f"{speed:.2f} B/s"
-        elif speed < 1024 * 1024:
-            return f"{speed/1024:.2f} KB/s"
+        if task.total_size <= 0:
+            eta = "N/A"
+        elif speed <= 0:
+            eta = "∞"
         else:
-            return f"{speed/(1024*1024):.2f} MB/s"
-
-    def _calculate_eta(self, task: DownloadTask) -> str:
-        """Calculate ETA for a task"""
-        if not task.start_time or task.progress <= 0 or task.total_size <= 0:
-            return "N/A"
-
-        elapsed_time = time() - task.start_time
-        if elapsed_time <= 0:
-            return "N/A"
-
-        speed = task.progress / elapsed_time
-        if speed <= 0:
-            return "∞"
-
-        remaining_bytes = task.total_size - task.progress
-        eta_seconds = remaining_bytes / speed
+            eta = self._format_time((task.total_size - task.progress) // speed)
 
-        return self._format_time(eta_seconds)
+        return self._format_speed(speed), eta
@@ -1,8 +1,10 @@
 import asyncio
 import os
+from collections import deque
+from io import BytesIO
 from pathlib import Path
-from time import time
-from typing import Dict, List, Optional
+from time import monotonic, monotonic_ns, time
+from typing import Deque, Dict, List, Optional, Set, Tuple, Union
 
 from pyrogram import Client
 from pyrogram.errors import RPCError
@@ -10,7 +12,8 @@ from pyrogram.types import InputMediaPhoto, InputMediaVideo, Message
 
 from hypersave.logger import logger
 from hypersave.models.upload_task import UploadTask
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
+from hypersave.utils.fair_queue import FairQueue
 from hypersave.utils.media_processor import (
     get_video_info,
     get_video_thumbnail,
@@ -18,37 +21,71 @@ from hypersave.utils.media_processor import (
     process_video_thumb,
 )
 
+# Progress message, filled with str.format_map
+PROGRESS_TEMPLATE = "📤 Uploading: {percentage:.1f}%\n🚀 Speed: {speed}\n⏱️ ETA: {eta}"
+
+# Speed units, indexed by the number of 10-bit shifts of the byte rate
+SPEED_UNITS = ("B/s", "KB/s", "MB/s")
+
+# Seconds a get_queue_status() snapshot is reused
+STATUS_CACHE_TTL = 1
+
+# Number of completed task ids kept for status reports
+COMPLETED_HISTORY_SIZE = 1000
+
+# Minimum seconds between progress message edits
+PROGRESS_EDIT_INTERVAL = 2
+
+# File extensions uploaded as photo, video and audio
+PHOTO_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+VIDEO_EXTENSIONS = frozenset({".mp4", ".avi", ".mov", ".mkv"})
+AUDIO_EXTENSIONS = frozenset({".mp3", ".m4a", ".ogg", ".flac"})
+
 
 class UploadManager:
     def __init__(self, max_concurrent_uploads: int = 3):
-        self.upload_queue = asyncio.Queue()
-        self.upload_semaphore = asyncio.Semaphore(max_concurrent_uploads)
+        self.upload_queue = FairQueue()
+        self.max_concurrent_uploads = max_concurrent_uploads
 
         # Track active and completed uploads
         self.active_uploads: Dict[str, UploadTask] = {}
-        self.completed_uploads: List[str] = []
+        self.completed_uploads: Deque[str] = deque(maxlen=COMPLETED_HISTORY_SIZE)
+
+        # Cached get_queue_status() snapshot and when it was built
+        self._status_cache = None
+        self._status_cache_time = 0.0
 
-        # Processor task
-        self.processor_task = None
+        # Upload workers
+        self.workers: List[asyncio.Task] = []
+
+        # Running file cleanups (strong references until they finish)
+        self._cleanup_tasks: Set[asyncio.Task] = set()
         self.running = False
 
-        self.settings = Settings()
+        self.settings = get_settings()
+
+        # Private group uploads are forwarded to, read once
+        self.private_group_id = self.settings.private_group_id
 
     def start(self):
         """Start the upload manager processing loop"""
         if not self.running:
             self.running = True
-            self.processor_task = asyncio.create_task(self.process_upload_queue())
+            self.workers = [
+                asyncio.create_task(self.process_upload_queue())
+                for _ in range(self.max_concurrent_uploads)
+            ]
 
     async def stop(self):
         """Stop the upload manager"""
         self.running = False
-        if self.processor_task:
-            self.processor_task.cancel()
-            try:
-                await self.processor_task
-            except asyncio.CancelledError:
-                pass
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        # Let pending cleanups remove their files
+        await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
 
     async def enqueue_upload(
         self,
@@ -80,7 +117,8 @@ class UploadManager:
         caption = source_message.caption or ""
 
         # Verify the file exists
-        if not os.path.exists(file_path):
+        file_size = await self._file_size(file_path)
+        if file_size is None:
             await status_message.edit_text(f"❌ File not found: {file_path}")
             return task_id
 
@@ -96,7 +134,7 @@ class UploadManager:
             caption=caption,
             start_time=None,  # Will be set when upload starts
             progress=0,
-            total_size=os.path.getsize(file_path) if os.path.exists(file_path) else 0,
+            total_size=file_size,
             is_completed=False,
             is_media_group=False,
             media_group_id=None,
@@ -104,19 +142,13 @@ class UploadManager:
         )
 
         # Put task in queue
+        position = self.upload_queue.next_position(user_id)
         await self.upload_queue.put(task)
+        self._status_cache = None
 
         # Update status message if provided
         if status_message:
-            # Store last message text to avoid duplicate updates
-            task.last_progress_text = (
-                f"⏳ Upload queued. Position: {self.upload_queue.qsize()}"
-            )
-            try:
-                await status_message.edit_text(task.last_progress_text)
-            except Exception as e:
-                if "MESSAGE_NOT_MODIFIED" not in str(e):
-                    logger.error(f"Error updating upload queue status: {e}")
+            task.status.set(f"⏳ Upload queued. Position: {position}")
 
         return task_id
 
@@ -124,7 +156,7 @@ class UploadManager:
         self,
         bot: Client,
         user_id: str,
-        file_paths: List[Path],
+        file_paths: List[Union[Path, BytesIO]],
         media_group_id: str,
         original_message: Message,
         status_message: Message,
@@ -136,7 +168,7 @@ class UploadManager:
         Args:
             bot: Bot client
             user_id: User identifier
-            file_paths: List of paths to the files to upload
+            file_paths: List of paths (or in-memory photos) to upload
             media_group_id: Media group identifier
             original_message: User's message that triggered the download
             status_message: Message for status updates
@@ -148,12 +180,16 @@ class UploadManager:
         # Create a unique task ID
         task_id = f"upload_group_{user_id}_{int(time())}_{media_group_id}"
 
-        # Filter out files that don't exist
+        # Filter out files that don't exist (stat them all concurrently)
+        sizes = await asyncio.gather(*(self._file_size(path) for path in file_paths))
+
         valid_files = []
         valid_captions = []
-        for i, path in enumerate(file_paths):
-            if os.path.exists(path):
+        total_size = 0
+        for i, (path, size) in enumerate(zip(file_paths, sizes)):
+            if size is not None:
                 valid_files.append(path)
+                total_size += size
                 # Adicionar a legenda correspondente se disponível
                 if media_captions and i < len(media_captions):
                     valid_captions.append(media_captions[i])
@@ -180,7 +216,7 @@ class UploadManager:
             caption="",  # Will be set per media item
             start_time=None,  # Will be set when upload starts
             progress=0,
-            total_size=sum(os.path.getsize(f) for f in valid_files),
+            total_size=total_size,
             is_completed=False,
             is_media_group=True,
             media_group_id=media_group_id,
@@ -189,103 +225,98 @@ class UploadManager:
         )
 
         # Put task in queue
+        position = self.upload_queue.next_position(user_id)
         await self.upload_queue.put(task)
+        self._status_cache = None
 
         # Update status message
         if status_message:
-            # Store last message text to avoid duplicate updates
-            task.last_progress_text = f"⏳ Media group upload queued ({len(valid_files)} items). Position: {self.upload_queue.qsize()}"
-            try:
-                await status_message.edit_text(task.last_progress_text)
-            except Exception as e:
-                if "MESSAGE_NOT_MODIFIED" not in str(e):
-                    logger.error(f"Error updating upload queue status: {e}")
+            task.status.set(
+                f"⏳ Media group upload queued ({len(valid_files)} items). Position: {position}"
+            )
 
         return task_id
 
+    async def _file_size(self, path: Union[Path, BytesIO]) -> Optional[int]:
+        """Size of a file or in-memory photo, None if the file doesn't exist
+
+        The stat runs in a thread so slow storage never blocks the event loop.
+        """
+        if isinstance(path, BytesIO):
+            return path.getbuffer().nbytes
+        try:
+            return (await asyncio.to_thread(os.stat, path)).st_size
+        except FileNotFoundError:
+            return None
+
     async def process_upload_queue(self):
-        """Process the upload queue in the background"""
+        """Upload worker: process queued tasks one at a time
+
+        max_concurrent_uploads of these run in parallel, which is what
+        limits the number of concurrent uploads.
+        """
         while self.running:
             try:
                 # Get next task
                 task = await self.upload_queue.get()
+            except asyncio.CancelledError:
+                break
 
-                # Process with semaphore to limit concurrent uploads
-                asyncio.create_task(self.process_upload_task(task))
-
+            try:
+                await self.process_upload_task(task)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in upload queue processor: {e}")
+            finally:
+                # Mark queue task as done
+                self.upload_queue.task_done()
 
     async def process_upload_task(self, task: UploadTask):
         """Process a single upload task"""
-        async with self.upload_semaphore:
-            try:
-                # Update task as active
-                self.active_uploads[task.task_id] = task
-
-                # Update status message
-                try:
-                    await task.status_message.edit_text("📤 Upload started...")
-                    task.last_progress_text = "📤 Upload started..."
-                except Exception as e:
-                    if "MESSAGE_NOT_MODIFIED" not in str(e):
-                        logger.error(f"Error updating upload start status: {e}")
-
-                # Mark upload start time
-                task.start_time = time()
-
-                # Process based on whether it's a media group or single file
-                if task.is_media_group:
-                    await self._upload_media_group(task)
-                else:
-                    # Check if file exists
-                    if not os.path.exists(task.file_path):
-                        await task.status_message.edit_text(
-                            f"❌ File not found for upload: {task.file_path}"
-                        )
-                        return
+        try:
+            # Update task as active
+            self.active_uploads[task.task_id] = task
 
-                    # Determine media type and upload accordingly
-                    await self._upload_media(task)
+            # Update status message
+            task.status.set("📤 Upload started...")
 
-                # Mark as completed
-                task.is_completed = True
-                self.completed_uploads.append(task.task_id)
+            # Mark upload start time
+            task.start_time = time()
+            task.start_ns = monotonic_ns()
 
-                # Update status
-                try:
-                    await task.status_message.edit_text("✅ Upload completed!")
-                    task.last_progress_text = "✅ Upload completed!"
-                except Exception as e:
-                    if "MESSAGE_NOT_MODIFIED" not in str(e):
-                        logger.error(f"Error updating upload completion status: {e}")
+            # Process based on whether it's a media group or single file
+            # (files were checked when the task was queued, a media group
+            # sets its own summary as the final status)
+            if task.is_media_group:
+                await self._upload_media_group(task)
+            else:
+                # Determine media type and upload accordingly
+                await self._upload_media(task)
+                task.status.set("✅ Upload completed!")
 
-                # Clean up files
-                await self._cleanup_files(task)
+            # Mark as completed
+            task.is_completed = True
+            self.completed_uploads.append(task.task_id)
 
-            except Exception as e:
-                # Update status with error
-                error_msg = f"❌ Upload failed: {str(e)}"
-                logger.error(f"Error processing upload task: {e}")
-                try:
-                    await task.status_message.edit_text(error_msg)
-                except Exception as msg_err:
-                    logger.error(f"Failed to send error message: {msg_err}")
-            finally:
-                # Remove from active uploads
-                if task.task_id in self.active_uploads:
-                    del self.active_uploads[task.task_id]
+            # Clean up files in the background so the worker moves on
+            cleanup = asyncio.create_task(self._cleanup_files(task))
+            self._cleanup_tasks.add(cleanup)
+            cleanup.add_done_callback(self._cleanup_tasks.discard)
 
-                # Mark queue task as done
-                self.upload_queue.task_done()
+        except Exception as e:
+            # Update status with error
+            error_msg = f"❌ Upload failed: {str(e)}"
+            logger.error(f"Error processing upload task: {e}")
+            task.status.set(error_msg)
+        finally:
+            # Remove from active uploads
+            self.active_uploads.pop(task.task_id, None)
+            self._status_cache = None
 
     async def _upload_media_group(self, task: UploadTask):
         """Process and upload a media group"""
         try:
-            # Prepare media list for the group
-            media_list = []
             chat_id = task.original_message.chat.id
             sent_message_ids = (
                 []
@@ -295,107 +326,51 @@ class UploadManager:
             status_text = (
                 f"📤 Processing media group ({len(task.media_group_files)} items)..."
             )
-            try:
-                await task.status_message.edit_text(status_text)
-                task.last_progress_text = status_text
-            except Exception as e:
-                if "MESSAGE_NOT_MODIFIED" not in str(e):
-                    logger.error(f"Error updating media group process status: {e}")
-
-            # Process each file in the group
-            for i, file_path in enumerate(task.media_group_files):
-                if not os.path.exists(file_path):
-                    logger.warning(f"File not found in media group: {file_path}")
-                    continue
-
-                file_ext = file_path.suffix.lower()
-
-                # Pegar a legenda específica para este item
-                caption = (
-                    task.media_captions[i]
-                    if task.media_captions and i < len(task.media_captions)
-                    else ""
-                )
-
-                # Process based on file type
-                if file_ext in [".jpg", ".jpeg", ".png"]:
-                    # Add as photo - ensure correct dimensions
-                    thumb_info = f"Processing photo {i+1}/{len(task.media_group_files)}"
-                    logger.info(thumb_info)
-
-                    # Add with caption
-                    media_list.append(
-                        InputMediaPhoto(media=str(file_path), caption=caption)
-                    )
+            task.status.set(status_text)
 
-                elif file_ext in [".mp4", ".avi", ".mov", ".mkv"]:
-                    try:
-                        # Process video
-                        await move_metadata_to_start(file_path)
-                        duration, width, height = await get_video_info(file_path)
-
-                        # Log video info
-                        video_info = f"Video {i+1}/{len(task.media_group_files)}: duration={duration}s, dimensions={width}x{height}"
-                        logger.info(video_info)
-
-                        # Generate thumbnail with proper aspect ratio
-                        thumb_path = file_path.with_suffix(".jpg")
-                        thumb_result = await get_video_thumbnail(file_path, thumb_path)
-
-                        # Add to media group, only include thumbnail if successfully created
-                        if thumb_result and os.path.exists(thumb_result):
-                            logger.info(f"Adding video with thumbnail: {thumb_result}")
-                            media_list.append(
-                                InputMediaVideo(
-                                    media=str(file_path),
-                                    thumb=str(thumb_result),
-                                    duration=duration,
-                                    width=width,
-                                    height=height,
-                                    caption=caption,  # Incluir a legenda
-                                )
-                            )
-                        else:
-                            logger.info("Adding video without thumbnail")
-                            media_list.append(
-                                InputMediaVideo(
-                                    media=str(file_path),
-                                    duration=duration,
-                                    width=width,
-                                    height=height,
-                                    caption=caption,  # Incluir a legenda
-                                )
-                            )
-                    except Exception as e:
-                        logger.error(f"Error processing video in media group: {e}")
-                        # Try adding without processing
-                        media_list.append(
-                            InputMediaVideo(media=str(file_path), caption=caption)
-                        )
-
-            # Send in batches (maximum of 10 per group - Telegram limit)
+            # Send in batches (maximum of 10 per group - Telegram limit),
+            # preparing the next files while the current batch is being sent.
+            # Batches are sliced from the prepared items so skipped files
+            # don't leave short albums behind.
             all_sent_messages = []  # Lista para armazenar todas as mensagens enviadas
             first_message_id = None  # Primeiro ID de mensagem para encaminhamento
+            files = task.media_group_files
+            media = []  # Itens preparados ainda não enviados
+            media_count = 0
+            batch_num = 0
+            next_start = 0
+            next_batch = (
+                asyncio.create_task(self._prepare_group_batch(task, 0))
+                if files
+                else None
+            )
+            try:
+                while True:
+                    while len(media) < 10 and next_batch:
+                        media.extend(await next_batch)
+                        next_start += 10
+                        next_batch = (
+                            asyncio.create_task(
+                                self._prepare_group_batch(task, next_start)
+                            )
+                            if next_start < len(files)
+                            else None
+                        )
+                    if not media:
+                        break
 
-            if media_list:
-                total_batches = (len(media_list) + 9) // 10  # Ceiling division
-
-                for i in range(0, len(media_list), 10):
-                    batch = media_list[i : i + 10]
-                    batch_num = i // 10 + 1
+                    batch, media = media[:10], media[10:]
+                    media_count += len(batch)
+                    batch_num += 1
+                    # Files not prepared yet are counted as valid
+                    remaining = len(media) + max(len(files) - next_start, 0)
+                    total_batches = batch_num + (remaining + 9) // 10
 
                     # Update status
                     status_text = (
                         f"📤 Sending media group... (Batch {batch_num}/{total_batches})"
                     )
-                    try:
-                        await task.status_message.edit_text(status_text)
-                        task.last_progress_text = status_text
-                    except Exception as e:
-                        if "MESSAGE_NOT_MODIFIED" not in str(e):
-                            logger.error(
-                                f"Error updating media group upload status: {e}"
-                            )
+                    task.status.set(status_text)
 
                     try:
                         # Send the group
@@ -421,88 +396,165 @@ class UploadManager:
                         )
                         logger.error(error_msg)
                         await task.original_message.reply(error_msg)
+            finally:
+                # Don't leave a prefetch running after an error or cancellation
+                if next_batch and not next_batch.done():
+                    next_batch.cancel()
+                    await asyncio.gather(next_batch, return_exceptions=True)
 
+            if media_count:
                 # Encaminhar para o grupo privado se configurado
-                if (
-                    all_sent_messages
-                    and hasattr(self.settings, "private_group_id")
-                    and self.settings.private_group_id
-                ):
-                    try:
-                        # Verificar se temos um media_group_id
-                        if first_message and first_message.media_group_id:
+                if all_sent_messages and self.private_group_id:
+                    forwarded = False
+
+                    # Verificar se temos um media_group_id
+                    if first_message and first_message.media_group_id:
+                        try:
                             logger.info(
-                                f"Encaminhando grupo de mídia para o grupo privado usando forward_media_group"
+                                "Encaminhando grupo de mídia para o grupo privado usando forward_media_group"
                             )
                             # Usar forward_media_group para encaminhar o grupo completo
                             await task.bot.forward_media_group(
-                                chat_id=self.settings.private_group_id,
+                                chat_id=self.private_group_id,
                                 from_chat_id=chat_id,
                                 message_id=first_message_id,
                             )
-                        else:
-                            # Fallback: encaminhar cada mensagem individualmente
-                            logger.info(
-                                f"Encaminhando mensagens individualmente para o grupo privado"
+                            forwarded = True
+                        except Exception as e:
+                            logger.error(
+                                f"Erro ao encaminhar para o grupo privado: {e}"
                             )
-                            for message_id in sent_message_ids:
-                                await task.bot.forward_messages(
-                                    chat_id=self.settings.private_group_id,
-                                    from_chat_id=chat_id,
-                                    message_ids=message_id,
-                                )
-                    except Exception as e:
-                        logger.error(f"Erro ao encaminhar para o grupo privado: {e}")
-                        # Tentar método alternativo
+
+                    if not forwarded:
+                        # Encaminhar todas as mensagens em uma única chamada
                         try:
                             logger.info(
-                                "Tentando método alternativo de encaminhamento usando forward_messages"
+                                "Encaminhando mensagens para o grupo privado usando forward_messages"
                             )
                             await task.bot.forward_messages(
-                                chat_id=self.settings.private_group_id,
+                                chat_id=self.private_group_id,
                                 from_chat_id=chat_id,
                                 message_ids=sent_message_ids,
                             )
-                        except Exception as e2:
-                            logger.error(f"Também falhou com método alternativo: {e2}")
+                        except Exception as e:
+                            logger.error(
+                                f"Erro ao encaminhar para o grupo privado: {e}"
+                            )
 
-                # Update final status
-                final_status = (
-                    f"✅ Media group sent successfully! ({len(media_list)} items)"
+            # Update final status with what actually reached the chat
+            sent_count = len(all_sent_messages)
+            failed_count = len(files) - sent_count
+            if not media_count:
+                task.status.set("❌ No valid media files found in the group")
+            elif not failed_count:
+                task.status.set(
+                    f"✅ Media group sent successfully! ({sent_count} items)"
                 )
-                try:
-                    await task.status_message.edit_text(final_status)
-                    task.last_progress_text = final_status
-                except Exception as e:
-                    if "MESSAGE_NOT_MODIFIED" not in str(e):
-                        logger.error(f"Error updating media group final status: {e}")
             else:
-                await task.status_message.edit_text(
-                    "❌ No valid media files found in the group"
+                icon = "⚠️" if sent_count else "❌"
+                task.status.set(
+                    f"{icon} Media group sent {sent_count} of {len(files)} items ({failed_count} failed)"
                 )
 
         except Exception as e:
             logger.error(f"Error in _upload_media_group: {e}")
-            await task.status_message.edit_text(
-                f"❌ Error processing media group: {str(e)}"
-            )
+            task.status.set(f"❌ Error processing media group: {str(e)}")
             raise
 
+    async def _prepare_group_batch(self, task: UploadTask, start: int) -> list:
+        """Prepare up to 10 media group items starting at start, concurrently
+
+        ffmpeg/OpenCV work is bounded inside the media processor.
+        """
+        files = task.media_group_files[start : start + 10]
+        prepared = await asyncio.gather(
+            *(
+                self._prepare_group_item(task, i, file_path)
+                for i, file_path in enumerate(files, start)
+            )
+        )
+        return [media for media in prepared if media]
+
+    async def _prepare_group_item(
+        self, task: UploadTask, i: int, file_path: Union[Path, BytesIO]
+    ) -> Optional[Union[InputMediaPhoto, InputMediaVideo]]:
+        """Build the InputMedia of a media group item, None if unsupported"""
+        # Pegar a legenda específica para este item
+        caption = (
+            task.media_captions[i]
+            if task.media_captions and i < len(task.media_captions)
+            else ""
+        )
+
+        if isinstance(file_path, BytesIO):
+            # Photo downloaded in memory, send the buffer as is
+            return InputMediaPhoto(media=file_path, caption=caption)
+
+        file_str = str(file_path)  # Pyrogram API takes the path as str
+        file_ext = file_path.suffix.lower()
+
+        # Process based on file type
+        if file_ext in PHOTO_EXTENSIONS:
+            # Add as photo - ensure correct dimensions
+            thumb_info = f"Processing photo {i+1}/{len(task.media_group_files)}"
+            logger.info(thumb_info)
+
+            # Add with caption
+            return InputMediaPhoto(media=file_str, caption=caption)
+
+        elif file_ext in VIDEO_EXTENSIONS:
+            try:
+                # Process video
+                await move_metadata_to_start(file_path)
+
+                # Generate thumbnail with proper aspect ratio while the
+                # video info is read (ffmpeg runs in its own process)
+                thumb_path = file_path.with_suffix(".jpg")
+                thumb_result, (duration, width, height) = await asyncio.gather(
+                    get_video_thumbnail(file_path, thumb_path),
+                    get_video_info(file_path),
+                )
+
+                # Log video info
+                video_info = f"Video {i+1}/{len(task.media_group_files)}: duration={duration}s, dimensions={width}x{height}"
+                logger.info(video_info)
+
+                # Add to media group, only include thumbnail if successfully created
+                video_kwargs = {"duration": duration, "width": width, "height": height}
+                if thumb_result:
+                    logger.info(f"Adding video with thumbnail: {thumb_result}")
+                    video_kwargs["thumb"] = str(thumb_result)
+                else:
+                    logger.info("Adding video without thumbnail")
+
+                return InputMediaVideo(
+                    media=file_str,
+                    caption=caption,  # Incluir a legenda
+                    **video_kwargs,
+                )
+            except Exception as e:
+                logger.error(f"Error processing video in media group: {e}")
+                # Try adding without processing
+                return InputMediaVideo(media=file_str, caption=caption)
+
+        return None
+
     async def _upload_media(self, task: UploadTask):
         """Upload media based on file type"""
         file_path = task.file_path
+        file_str = str(file_path)  # Pyrogram API takes the path as str
         file_ext = file_path.suffix.lower()
         chat_id = task.original_message.chat.id
         sent_message = None
 
         try:
             # Process media based on file type
-            if file_ext in [".jpg", ".jpeg", ".png"]:
+            if file_ext in PHOTO_EXTENSIONS:
                 # Upload as photo
                 try:
                     sent_message = await task.bot.send_photo(
                         chat_id=chat_id,
-                        photo=str(file_path),
+                        photo=file_str,
                         caption=task.caption,
                         progress=self._progress_callback,
                         progress_args=(task,),
@@ -513,16 +565,23 @@ class UploadManager:
                         # Try to send as document instead
                         sent_message = await task.bot.send_document(
                             chat_id=chat_id,
-                            document=str(file_path),
+                            document=file_str,
                             caption=task.caption,
                             progress=self._progress_callback,
                             progress_args=(task,),
                         )
 
-            elif file_ext in [".mp4", ".avi", ".mov", ".mkv"]:
+            elif file_ext in VIDEO_EXTENSIONS:
                 # Process video before upload
                 await move_metadata_to_start(file_path)
-                duration, width, height = await get_video_info(file_path)
+
+                # Create thumbnail using the same aspect ratio as the video
+                # while the video info is read
+                thumb_path = file_path.with_suffix(".jpg")
+                thumb_result, (duration, width, height) = await asyncio.gather(
+                    get_video_thumbnail(file_path, thumb_path),
+                    get_video_info(file_path),
+                )
 
                 # Log video information
                 video_info = (
@@ -530,41 +589,20 @@ class UploadManager:
                 )
                 logger.info(video_info)
 
-                # Create thumbnail using the same aspect ratio as the video
-                thumb_path = file_path.with_suffix(".jpg")
-                thumb_result = await get_video_thumbnail(file_path, thumb_path)
+                # Same arguments for every way the video is sent, the
+                # thumbnail only if it was created
+                video_kwargs = {
+                    "caption": task.caption,
+                    "duration": duration,
+                    "width": width,
+                    "height": height,
+                }
+                if thumb_result:
+                    video_kwargs["thumb"] = str(thumb_result)
 
                 # Upload video
-                if duration <= 180:  # Short video
-                    # Upload with thumbnail if available
-                    if thumb_result and os.path.exists(thumb_result):
-                        logger.info(
-                            f"Sending short video with thumbnail: {thumb_result}"
-                        )
-                        sent_message = await task.bot.send_video(
-                            chat_id=chat_id,
-                            video=str(file_path),
-                            caption=task.caption,
-                            duration=duration,
-                            width=width,
-                            height=height,
-                            thumb=str(thumb_result),
-                            progress=self._progress_callback,
-                            progress_args=(task,),
-                        )
-                    else:
-                        logger.info("Sending short video without thumbnail")
-                        sent_message = await task.bot.send_video(
-                            chat_id=chat_id,
-                            video=str(file_path),
-                            caption=task.caption,
-                            duration=duration,
-                            width=width,
-                            height=height,
-                            progress=self._progress_callback,
-                            progress_args=(task,),
-                        )
-                else:  # Longer video, create timeline preview
+                send_video = True
+                if duration > 180:  # Longer video, create timeline preview
                     # Timeline preview should be created with proper aspect ratio
                     thumb_preview_path = file_path.with_suffix(".thumb.jpg")
 
@@ -573,141 +611,65 @@ class UploadManager:
                         file_path, thumb_preview_path, duration
                     )
 
-                    if preview_result and os.path.exists(preview_result):
+                    if preview_result:
                         logger.info(f"Preview thumbnail created: {preview_result}")
 
-                        # Verify if thumbnail exists
-                        if not thumb_result or not os.path.exists(thumb_result):
-                            # If main thumbnail failed, try to create it again
-                            thumb_result = await get_video_thumbnail(
-                                file_path, thumb_path
-                            )
-                            logger.info(f"Recreated main thumbnail: {thumb_result}")
-
-                        # If both thumbnails exist, send as media group
-                        if thumb_result and os.path.exists(thumb_result):
-                            logger.info(
-                                f"Sending video with timeline preview as media group"
+                        logger.info(
+                            "Sending video with timeline preview as media group"
+                        )
+                        try:
+                            # Create media group
+                            media_group = [
+                                InputMediaVideo(media=file_str, **video_kwargs),
+                                InputMediaPhoto(media=str(preview_result)),
+                            ]
+
+                            # Send media group
+                            sent_messages = await task.bot.send_media_group(
+                                chat_id=chat_id, media=media_group
                             )
+                            send_video = False
 
-                            try:
-                                # Create media group
-                                media_group = [
-                                    InputMediaVideo(
-                                        media=str(file_path),
-                                        caption=task.caption,
-                                        thumb=str(thumb_result),
-                                        duration=duration,
-                                        width=width,
-                                        height=height,
-                                    ),
-                                    InputMediaPhoto(media=str(preview_result)),
-                                ]
-
-                                # Send media group
-                                sent_messages = await task.bot.send_media_group(
-                                    chat_id=chat_id, media=media_group
-                                )
-
-                                if sent_messages:
-                                    sent_message = sent_messages[
-                                        0
-                                    ]  # Use first message as reference
-                                    logger.info(
-                                        f"Successfully sent video with timeline preview"
-                                    )
-                                else:
-                                    logger.warning(
-                                        "No messages returned from send_media_group"
-                                    )
-                            except Exception as e:
-                                logger.error(f"Error sending media group: {e}")
-                                # Fallback to sending just the video
+                            if sent_messages:
+                                # Use first message as reference
+                                sent_message = sent_messages[0]
                                 logger.info(
-                                    "Falling back to sending video without preview"
-                                )
-                                sent_message = await task.bot.send_video(
-                                    chat_id=chat_id,
-                                    video=str(file_path),
-                                    caption=task.caption,
-                                    duration=duration,
-                                    width=width,
-                                    height=height,
-                                    thumb=(
-                                        str(thumb_result)
-                                        if thumb_result and os.path.exists(thumb_result)
-                                        else None
-                                    ),
-                                    progress=self._progress_callback,
-                                    progress_args=(task,),
+                                    "Successfully sent video with timeline preview"
                                 )
-                        else:
-                            # If only the preview exists but no thumbnail
-                            logger.info(f"Sending video with only timeline preview")
-                            try:
-                                media_group = [
-                                    InputMediaVideo(
-                                        media=str(file_path),
-                                        caption=task.caption,
-                                        duration=duration,
-                                        width=width,
-                                        height=height,
-                                    ),
-                                    InputMediaPhoto(media=str(preview_result)),
-                                ]
-
-                                sent_messages = await task.bot.send_media_group(
-                                    chat_id=chat_id, media=media_group
-                                )
-
-                                if sent_messages:
-                                    sent_message = sent_messages[0]
-                                    logger.info(
-                                        f"Successfully sent video with timeline preview (no thumbnail)"
-                                    )
-                            except Exception as e:
-                                logger.error(
-                                    f"Error sending media group with only preview: {e}"
-                                )
-                                # Fallback to sending just the video
-                                sent_message = await task.bot.send_video(
-                                    chat_id=chat_id,
-                                    video=str(file_path),
-                                    caption=task.caption,
-                                    duration=duration,
-                                    width=width,
-                                    height=height,
-                                    progress=self._progress_callback,
-                                    progress_args=(task,),
+                            else:
+                                logger.warning(
+                                    "No messages returned from send_media_group"
                                 )
+                        except Exception as e:
+                            logger.error(f"Error sending media group: {e}")
+                            # Fallback to sending just the video
+                            logger.info("Falling back to sending video without preview")
                     else:
                         # If timeline preview creation failed
                         logger.warning(
                             "Failed to create timeline preview, sending video only"
                         )
-                        sent_message = await task.bot.send_video(
-                            chat_id=chat_id,
-                            video=str(file_path),
-                            caption=task.caption,
-                            duration=duration,
-                            width=width,
-                            height=height,
-                            thumb=(
-                                str(thumb_result)
-                                if thumb_result and os.path.exists(thumb_result)
-                                else None
-                            ),
-                            progress=self._progress_callback,
-                            progress_args=(task,),
-                        )
+                elif thumb_result:
+                    logger.info(f"Sending short video with thumbnail: {thumb_result}")
+                else:
+                    logger.info("Sending short video without thumbnail")
+
+                if send_video:
+                    sent_message = await task.bot.send_video(
+                        chat_id=chat_id,
+                        video=file_str,
+                        progress=self._progress_callback,
+                        progress_args=(task,),
+                        **video_kwargs,
+                    )
 
                 # Clean up thumbnail and preview files - moved to _cleanup_files
 
-            elif file_ext in [".mp3", ".m4a", ".ogg", ".flac"]:
+            elif file_ext in AUDIO_EXTENSIONS:
                 # Upload as audio
                 sent_message = await task.bot.send_audio(
                     chat_id=chat_id,
-                    audio=str(file_path),
+                    audio=file_str,
                     caption=task.caption,
                     progress=self._progress_callback,
                     progress_args=(task,),
@@ -717,7 +679,7 @@ class UploadManager:
                 # Upload as document for other types
                 sent_message = await task.bot.send_document(
                     chat_id=chat_id,
-                    document=str(file_path),
+                    document=file_str,
                     caption=task.caption,
                     progress=self._progress_callback,
                     progress_args=(task,),
@@ -726,22 +688,16 @@ class UploadManager:
             # Forward to private group if configured and message was sent successfully
             if sent_message:
                 # Encaminhar para o grupo privado, se configurado
-                if (
-                    hasattr(self.settings, "private_group_id")
-                    and self.settings.private_group_id
-                ):
+                if self.private_group_id:
                     try:
                         # Verificar se esta é uma mensagem de grupo de mídia
-                        if (
-                            hasattr(sent_message, "media_group_id")
-                            and sent_message.media_group_id
-                        ):
+                        if sent_message.media_group_id:
                             logger.info(
                                 f"Enviando mensagem de grupo de mídia para o grupo privado usando forward_media_group"
                             )
                             # Usar forward_media_group para encaminhar o grupo completo
                             await task.bot.forward_media_group(
-                                chat_id=self.settings.private_group_id,
+                                chat_id=self.private_group_id,
                                 from_chat_id=chat_id,
                                 message_id=sent_message.id,
                             )
@@ -750,15 +706,13 @@ class UploadManager:
                             logger.info(
                                 f"Encaminhando mensagem individual para o grupo privado"
                             )
-                            await sent_message.forward(
-                                chat_id=self.settings.private_group_id
-                            )
+                            await sent_message.forward(chat_id=self.private_group_id)
                     except Exception as e:
                         logger.error(f"Erro ao encaminhar para o grupo privado: {e}")
                         # Método alternativo
                         try:
                             await task.bot.forward_messages(
-                                chat_id=self.settings.private_group_id,
+                                chat_id=self.private_group_id,
                                 from_chat_id=chat_id,
                                 message_ids=sent_message.id,
                             )
@@ -767,63 +721,41 @@ class UploadManager:
 
         except RPCError as e:
             logger.error(f"Telegram API error: {str(e)}")
-            await task.status_message.edit_text(f"❌ Telegram API error: {str(e)}")
+            task.status.set(f"❌ Telegram API error: {str(e)}")
             raise
         except Exception as e:
             logger.error(f"Upload error: {str(e)}")
-            await task.status_message.edit_text(f"❌ Upload error: {str(e)}")
+            task.status.set(f"❌ Upload error: {str(e)}")
             raise
 
     async def _cleanup_files(self, task: UploadTask):
         """Clean up files after upload"""
         try:
-            if task.is_media_group:
-                # Clean up all files in the group
-                for file_path in task.media_group_files:
-                    if os.path.exists(file_path):
-                        try:
-                            os.remove(file_path)
-                        except Exception as e:
-                            logger.warning(f"Error removing media group file: {e}")
-
-                    # Also remove thumbnails if they exist
-                    thumb_path = file_path.with_suffix(".jpg")
-                    if os.path.exists(thumb_path):
-                        try:
-                            os.remove(thumb_path)
-                        except Exception as e:
-                            logger.warning(f"Error removing thumbnail: {e}")
+            files = task.media_group_files if task.is_media_group else [task.file_path]
 
-                    # Remove timeline preview if it exists
-                    thumb_preview = file_path.with_suffix(".thumb.jpg")
-                    if os.path.exists(thumb_preview):
-                        try:
-                            os.remove(thumb_preview)
-                        except Exception as e:
-                            logger.warning(f"Error removing preview thumbnail: {e}")
-            else:
-                # Clean up the single file
-                if os.path.exists(task.file_path):
-                    try:
-                        os.remove(task.file_path)
-                    except Exception as e:
-                        logger.warning(f"Error removing file: {e}")
+            paths = []
+            for file_path in files:
+                if isinstance(file_path, BytesIO):
+                    file_path.close()
+                    continue
 
-                # Clean up thumbnails
-                thumb_path = task.file_path.with_suffix(".jpg")
-                if os.path.exists(thumb_path):
-                    try:
-                        os.remove(thumb_path)
-                    except Exception as e:
-                        logger.warning(f"Error removing thumbnail: {e}")
+                # The file itself, its thumbnail and its timeline preview
+                paths.extend(
+                    (
+                        file_path,
+                        file_path.with_suffix(".jpg"),
+                        file_path.with_suffix(".thumb.jpg"),
+                    )
+                )
 
-                # Clean up timeline preview
-                thumb_preview = task.file_path.with_suffix(".thumb.jpg")
-                if os.path.exists(thumb_preview):
-                    try:
-                        os.remove(thumb_preview)
-                    except Exception as e:
-                        logger.warning(f"Error removing preview thumbnail: {e}")
+            # Remove everything concurrently off the event loop
+            results = await asyncio.gather(
+                *(asyncio.to_thread(path.unlink, missing_ok=True) for path in paths),
+                return_exceptions=True,
+            )
+            for path, result in zip(paths, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error removing file {path}: {result}")
         except Exception as e:
             logger.error(f"Error cleaning up files: {e}")
 
@@ -834,50 +766,41 @@ class UploadManager:
 
         # Update task progress
         task.progress = current
-        task.total_size = total
+        if task.total_size != total:
+            task.total_size = total
+
+        # Update status periodically (not too often to avoid flood)
+        now = monotonic()
+        if current != total and now - task.last_progress_edit < PROGRESS_EDIT_INTERVAL:
+            return
+        task.last_progress_edit = now
 
         # Calculate percentage and speed
         percentage = current * 100 / total
-        elapsed_time = time() - task.start_time
-        speed = current / elapsed_time if elapsed_time > 0 else 0
+        elapsed_ns = monotonic_ns() - task.start_ns
+        speed = current * 1_000_000_000 // elapsed_ns if elapsed_ns > 0 else 0
 
         # Calculate ETA
         if speed > 0:
-            eta = (total - current) / speed
+            eta = (total - current) // speed
             eta_str = self._format_time(eta)
         else:
             eta_str = "∞"
 
         # Format speed string
-        if speed < 1024:
-            speed_str = f"{speed:.2f} B/s"
-        elif speed < 1024 * 1024:
-            speed_str = f"{speed/1024:.2f} KB/s"
-        else:
-            speed_str = f"{speed/(1024*1024):.2f} MB/s"
-
-        # Store previous progress info to avoid duplicate updates
-        if not hasattr(task, "last_progress_text"):
-            task.last_progress_text = ""
+        speed_str = self._format_speed(speed)
 
         # Prepare new progress text
-        new_progress_text = (
-            f"📤 Uploading: {percentage:.1f}%\n"
-            f"🚀 Speed: {speed_str}\n"
-            f"⏱️ ETA: {eta_str}"
+        new_progress_text = PROGRESS_TEMPLATE.format_map(
+            {"percentage": percentage, "speed": speed_str, "eta": eta_str}
         )
 
-        # Only update if the text actually changed or at 100%
-        if new_progress_text != task.last_progress_text or current == total:
-            # Update status periodically (not too often to avoid flood)
-            if current == total or current % (max(1, total // 10)) == 0:
-                try:
-                    await task.status_message.edit_text(new_progress_text)
-                    task.last_progress_text = new_progress_text
-                except Exception as e:
-                    # Ignore MESSAGE_NOT_MODIFIED errors
-                    if "MESSAGE_NOT_MODIFIED" not in str(e):
-                        logger.error(f"Error updating progress: {e}")
+        task.status.set(new_progress_text)
+
+    def _format_speed(self, speed: float) -> str:
+        """Format bytes per second into readable speed string"""
+        unit = min(max(int(speed).bit_length() - 1, 0) // 10, len(SPEED_UNITS) - 1)
+        return f"{speed / (1 << (10 * unit)):.2f} {SPEED_UNITS[unit]}"
 
     def _format_time(self, seconds: float) -> str:
         """Format seconds into readable time string"""
@@ -889,64 +812,64 @@ class UploadManager:
             return f"{seconds//3600:.0f}h {(seconds%3600)//60:.0f}m"
 
     def get_queue_status(self) -> Dict:
-        """Get current status of upload queue"""
+        """Get current status of upload queue
+
+        The snapshot is reused for STATUS_CACHE_TTL seconds unless a task
+        was queued or finished in the meantime.
+        """
+        now = monotonic()
+        if (
+            self._status_cache is None
+            or now - self._status_cache_time >= STATUS_CACHE_TTL
+        ):
+            self._status_cache = self._build_queue_status()
+            self._status_cache_time = now
+        return self._status_cache
+
+    def _build_queue_status(self) -> Dict:
+        """Build a status snapshot of the upload queue"""
         return {
             "queue_size": self.upload_queue.qsize(),
             "active_uploads": len(self.active_uploads),
             "active_tasks": [
-                {
-                    "task_id": task_id,
-                    "user_id": task.user_id,
-                    "file": task.file_path.name if task.file_path else "Media Group",
-                    "progress": (
-                        f"{(task.progress / task.total_size * 100):.1f}%"
-                        if task.total_size
-                        else "0%"
-                    ),
-                    "speed": self._calculate_speed(task) if task.start_time else "N/A",
-                    "eta": (
-                        self._calculate_eta(task)
-                        if task.start_time and task.total_size and task.progress
-                        else "N/A"
-                    ),
-                }
+                self._task_status(task_id, task)
                 for task_id, task in self.active_uploads.items()
             ],
             "completed_tasks": len(self.completed_uploads),
         }
 
-    def _calculate_speed(self, task: UploadTask) -> str:
-        """Calculate current upload speed for a task"""
+    def _task_status(self, task_id: str, task: UploadTask) -> Dict:
+        """Status entry of an active task"""
+        speed, eta = self._calculate_speed_and_eta(task)
+        return {
+            "task_id": task_id,
+            "user_id": task.user_id,
+            "file": task.file_path.name if task.file_path else "Media Group",
+            "progress": (
+                f"{(task.progress / task.total_size * 100):.1f}%"
+                if task.total_size
+                else "0%"
+            ),
+            "speed": speed,
+            "eta": eta,
+        }
+
+    def _calculate_speed_and_eta(self, task: UploadTask) -> Tuple[str, str]:
+        """Current upload speed and ETA for a task, from one speed sample"""
         if not task.start_time:
-            return "N/A"
+            return "N/A", "N/A"
 
-        elapsed_time = time() - task.start_time
-        if elapsed_time <= 0 or task.progress <= 0:
-            return "0 B/s"
+        elapsed_ns = monotonic_ns() - task.start_ns
+        if elapsed_ns <= 0 or task.progress <= 0:
+            return "0 B/s", "N/A"
 
-        speed = task.progress / elapsed_time
+        speed = task.progress * 1_000_000_000 // elapsed_ns
 
-        if speed < 1024:
-            return f"{speed:.2f} B/s"
-        elif speed < 1024 * 1024:
-            return f"{speed/1024:.2f} KB/s"
+        if task.total_size <= 0:
+            eta = "N/A"
+        elif speed <= 0:
+            eta = "∞"
         else:
-            return f"{speed/(1024*1024):.2f} MB/s"
-
-    def _calculate_eta(self, task: UploadTask) -> str:
-        """Calculate ETA for a task"""
-        if not task.start_time or task.progress <= 0 or task.total_size <= 0:
-            return "N/A"
-
-        elapsed_time = time() - task.start_time
-        if elapsed_time <= 0:
-            return "N/A"
-
-        speed = task.progress / elapsed_time
-        if speed <= 0:
-            return "∞"
-
-        remaining_bytes = task.total_size - task.progress
-        eta_seconds = remaining_bytes / speed
+            eta = self._format_time((task.total_size - task.progress) // speed)
 
-        return self._format_time(eta_seconds)
+        return self._format_speed(speed), eta
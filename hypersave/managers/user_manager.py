@@ -1,26 +1,34 @@
 import asyncio
+from collections import OrderedDict
 from time import time
 from typing import Dict, Optional
 
 from pyrogram import Client
 from pyrogram.errors import RPCError
 
-from hypersave.database.user_repository import UserRepository
+from hypersave.database.user_repository import get_user_repository
+from hypersave.logger import logger
 from hypersave.models.user_client import UserClient
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 
 
 class UserManager:
     def __init__(self):
-        self.settings = Settings()
-        self.user_repository = UserRepository()
+        self.settings = get_settings()
+        self.user_repository = get_user_repository()
 
-        # Cache for active user clients
-        self.user_clients: Dict[str, UserClient] = {}
+        # LRU cache for active user clients (least recently used first)
+        self.user_clients: "OrderedDict[str, UserClient]" = OrderedDict()
+
+        # Maximum number of clients kept connected at the same time
+        self.max_clients = 100
 
         # Client inactivity timeout (2 hours)
         self.client_timeout = 7200  # seconds
 
+        # Interval between inactive client checks
+        self.cleanup_interval = 60  # seconds
+
         # Background task for cleaning inactive clients
         self.cleanup_task = None
         self.running = False
@@ -42,10 +50,11 @@ class UserManager:
             except asyncio.CancelledError:
                 pass
 
-        # Disconnect all active clients
-        for user_id, client in self.user_clients.items():
-            if client.is_connected:
-                await client.stop()
+        # Disconnect all active clients concurrently
+        await asyncio.gather(
+            *(c.stop() for c in self.user_clients.values() if c.is_connected),
+            return_exceptions=True,
+        )
 
         self.user_clients.clear()
 
@@ -60,9 +69,10 @@ class UserManager:
             UserClient object if successful, None otherwise
         """
         # Check if client already exists and is connected
-        if user_id in self.user_clients and self.user_clients[user_id].is_connected:
-            client = self.user_clients[user_id]
+        client = self.user_clients.get(user_id)
+        if client and client.is_connected:
             client.last_used = time()
+            self.user_clients.move_to_end(user_id)
             return client
 
         # Not found or not connected, try to create a new one
@@ -101,14 +111,38 @@ class UserManager:
 
             # Cache the client
             self.user_clients[user_id] = client
+            self.user_clients.move_to_end(user_id)
+
+            # Evict the least recently used idle clients over the limit,
+            # clients still used by downloads stay until they are released
+            excess = len(self.user_clients) - self.max_clients
+            if excess > 0:
+                idle_ids = [
+                    uid
+                    for uid, c in self.user_clients.items()
+                    if not c.in_use and uid != user_id
+                ][:excess]
+                for evicted_id in idle_ids:
+                    evicted = self.user_clients.pop(evicted_id)
+                    try:
+                        if evicted.is_connected:
+                            await evicted.stop()
+                    except Exception as e:
+                        # The new client is already running, don't lose it
+                        logger.error(
+                            "Error stopping evicted user client {}: {}", evicted_id, e
+                        )
+                    logger.info("Evicted user client {} (cache full)", evicted_id)
 
             return client
 
         except RPCError as e:
-            print(f"Telegram API error creating client for user {user_id}: {e}")
+            logger.error(
+                "Telegram API error creating client for user {}: {}", user_id, e
+            )
             return None
-        except Exception as e:
-            print(f"Error creating client for user {user_id}: {e}")
+        except Exception:
+            logger.exception("Error creating client for user {}", user_id)
             return None
 
     async def save_session_string(self, user_id: str, session_string: str) -> bool:
@@ -131,29 +165,34 @@ class UserManager:
                 current_time = time()
                 to_remove = []
 
-                # Find inactive clients
+                # Find inactive clients (not used by any download)
                 for user_id, client in self.user_clients.items():
-                    if current_time - client.last_used > self.client_timeout:
+                    if (
+                        not client.in_use
+                        and current_time - client.last_used > self.client_timeout
+                    ):
                         to_remove.append(user_id)
 
-                # Stop and remove inactive clients
-                for user_id in to_remove:
-                    client = self.user_clients[user_id]
-                    if client.is_connected:
-                        await client.stop()
-                    del self.user_clients[user_id]
+                # Remove inactive clients and stop them concurrently
+                removed = [
+                    self.user_clients.pop(user_id, None) for user_id in to_remove
+                ]
+                await asyncio.gather(
+                    *(c.stop() for c in removed if c and c.is_connected),
+                    return_exceptions=True,
+                )
 
                 # Log cleanup if any clients were removed
                 if to_remove:
-                    print(f"Cleaned up {len(to_remove)} inactive user clients")
+                    logger.info("Cleaned up {} inactive user clients", len(to_remove))
 
-                # Sleep for a while before next check (10 minutes)
-                await asyncio.sleep(600)
+                # Sleep for a while before next check
+                await asyncio.sleep(self.cleanup_interval)
 
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                print(f"Error in client cleanup task: {e}")
+            except Exception:
+                logger.exception("Error in client cleanup task")
                 await asyncio.sleep(60)  # Short sleep on error
 
     def get_active_users_count(self) -> int:
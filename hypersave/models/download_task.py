@@ -5,6 +5,8 @@ from typing import Any, List, Optional
 from pyrogram import Client
 from pyrogram.types import Message
 
+from hypersave.models.user_client import UserClient
+
 
 @dataclass
 class DownloadTask:
@@ -15,7 +17,7 @@ class DownloadTask:
     user_id: str
 
     # Telegram info
-    user_client: Client
+    user_client: UserClient
     chat_id: Any  # Can be int or str
     message_id: int
 
@@ -44,3 +46,9 @@ class DownloadTask:
 
     # Lista para armazenar legendas de cada item em um grupo de mídia
     media_captions: List[str] = None
+
+    # time.monotonic_ns() at start, used for speed and ETA
+    start_ns: int = 0
+
+    # Last text shown in status_message, to skip duplicate edits
+    last_progress_text: str = ""
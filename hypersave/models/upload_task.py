@@ -5,8 +5,10 @@ from typing import List, Optional
 from pyrogram import Client
 from pyrogram.types import Message
 
+from hypersave.utils.status_updater import StatusUpdater
 
-@dataclass
+
+@dataclass(slots=True)
 class UploadTask:
     """Represents an upload task"""
 
@@ -39,3 +41,16 @@ class UploadTask:
     media_group_id: Optional[str] = None
     media_group_files: List[Path] = None
     media_captions: List[str] = None  # Lista de legendas para grupos de mídia
+
+    # time.monotonic() of the last progress message edit
+    last_progress_edit: float = 0.0
+
+    # time.monotonic_ns() at start, used for speed and ETA
+    start_ns: int = 0
+
+    # Throttled editor for status_message, created from it
+    status: Optional[StatusUpdater] = None
+
+    def __post_init__(self):
+        if self.status is None:
+            self.status = StatusUpdater(self.status_message)
@@ -11,9 +11,27 @@ class UserClient(Client):
         self.user_id = None
         self.last_used = time()
 
+        # Queued or running downloads using this client, it must not be
+        # stopped while any are left
+        self.active_tasks = 0
+
     async def start(self):
         """Start client and set user_id"""
         await super().start()
         self.user_id = (await self.get_me()).id
         self.last_used = time()
         return self
+
+    def acquire(self):
+        """Mark the client as used by a download task"""
+        self.active_tasks += 1
+
+    def release(self):
+        """Mark a download task using the client as finished"""
+        self.active_tasks -= 1
+        self.last_used = time()
+
+    @property
+    def in_use(self) -> bool:
+        """Whether download tasks still use this client"""
+        return self.active_tasks > 0
@@ -3,12 +3,12 @@ from typing import Callable, Union
 from pyrogram import filters
 from pyrogram.types import CallbackQuery, Message
 
-from hypersave.settings import Settings
+from hypersave.settings import Settings, get_settings
 
 
 class CustomFilters:
     def __init__(self):
-        self.settings: Settings = Settings()
+        self.settings: Settings = get_settings()
 
     def create_admin_filter(self) -> Callable:
         async def func(flt, client, update: Union[Message, CallbackQuery]):
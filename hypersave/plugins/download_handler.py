@@ -1,4 +1,3 @@
-import re
 import traceback
 
 from pyrogram import Client, filters
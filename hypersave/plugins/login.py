@@ -15,13 +15,13 @@ from pyrogram.errors import (
 from pyrogram.types import Message
 
 from hypersave.bot import ClientBot
-from hypersave.database.user_repository import UserRepository
+from hypersave.database.user_repository import get_user_repository
 from hypersave.logger import logger
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 from hypersave.utils.message_utils import save_message_info
 
-settings = Settings()
-user_repository = UserRepository()
+settings = get_settings()
+user_repository = get_user_repository()
 
 
 @ClientBot.on_message(filters.command("login") & filters.private)
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import field_validator
@@ -14,6 +15,9 @@ class Settings(BaseSettings):
     private_group_id: int
     admin_ids: list[int] | int
 
+    # Files the bot client saves/sends at the same time
+    max_bot_concurrency: int = 10
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -56,3 +60,9 @@ class Settings(BaseSettings):
         os.makedirs("sessions", exist_ok=True)
         self.DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
         self.THUMBS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use"""
+    return Settings()
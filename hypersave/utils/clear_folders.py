@@ -2,9 +2,9 @@ import os
 from shutil import rmtree
 
 from hypersave.logger import logger
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 
 
 def clear_and_create_folders() -> None:
@@ -2,9 +2,9 @@ import os
 from pathlib import Path
 
 from hypersave.logger import logger
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 
 
 def ensure_directories_exist():
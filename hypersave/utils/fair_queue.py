@@ -0,0 +1,67 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class FairQueue(asyncio.Queue):
+    """asyncio.Queue that serves users in round-robin order
+
+    Items are grouped by their user_id attribute and get() takes the next
+    item of the next user in turn, so a user who queues many tasks
+    can't hold every slot while others wait. Order is FIFO per user.
+    """
+
+    def _init(self, maxsize: int):
+        self._user_queues: Dict[str, Deque[Any]] = {}
+        self._size = 0
+
+        # Users with queued items, in the order they will be served
+        self._queue: Deque[str] = deque()
+
+    def _put(self, item: Any):
+        user_queue = self._user_queues.get(item.user_id)
+        if user_queue is None:
+            user_queue = self._user_queues[item.user_id] = deque()
+            self._queue.append(item.user_id)
+
+        user_queue.append(item)
+        self._size += 1
+
+    def _get(self) -> Any:
+        user_id = self._queue.popleft()
+        user_queue = self._user_queues[user_id]
+        item = user_queue.popleft()
+
+        # Back to the end of the line if the user still has items
+        if user_queue:
+            self._queue.append(user_id)
+        else:
+            del self._user_queues[user_id]
+
+        self._size -= 1
+        return item
+
+    def qsize(self) -> int:
+        """Number of items in the queue"""
+        return self._size
+
+    def empty(self) -> bool:
+        """Return True if the queue is empty"""
+        return not self._size
+
+    def next_position(self, user_id: str) -> int:
+        """Number of gets until a new item of this user would be served"""
+        # Each round serves one item of every user in line, a new item of
+        # the user goes out in the round after their queued ones
+        user_queue = self._user_queues.get(user_id)
+        rounds = len(user_queue) + 1 if user_queue else 1
+
+        position = 0
+        ahead = True
+        for uid in self._queue:
+            if uid == user_id:
+                ahead = False
+            position += min(
+                len(self._user_queues[uid]), rounds if ahead else rounds - 1
+            )
+        return position + 1
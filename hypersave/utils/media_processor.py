@@ -1,7 +1,9 @@
 import asyncio
+import multiprocessing
 import os
 import shutil
 from asyncio.subprocess import PIPE
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from shutil import rmtree
 
@@ -9,9 +11,47 @@ import cv2
 from PIL import Image, ImageDraw, ImageFont, UnidentifiedImageError
 
 from hypersave.logger import logger
-from hypersave.settings import Settings
+from hypersave.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
+
+# Workers for blocking OpenCV/Pillow work and cap on concurrent ffmpeg jobs
+MAX_MEDIA_WORKERS = min(4, os.cpu_count() or 1)
+
+_media_pool = None
+_media_semaphore = asyncio.BoundedSemaphore(MAX_MEDIA_WORKERS)
+
+
+def _get_media_pool() -> ProcessPoolExecutor:
+    global _media_pool
+    if _media_pool is None:
+        # Forking the bot process (event loop, Pyrogram and loguru threads)
+        # can deadlock the children, so start workers from a forkserver
+        _media_pool = ProcessPoolExecutor(
+            max_workers=MAX_MEDIA_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _media_pool
+
+
+async def _run_in_pool(func, *args):
+    """Run a blocking media function in the worker process pool"""
+    async with _media_semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_media_pool(), func, *args)
+
+
+async def _run_ffmpeg(cmd: list) -> tuple:
+    """
+    Run an ffmpeg/ffprobe command
+
+    Returns:
+        tuple: (returncode, stdout, stderr)
+    """
+    async with _media_semaphore:
+        process = await asyncio.create_subprocess_exec(*cmd, stderr=PIPE, stdout=PIPE)
+        stdout, stderr = await process.communicate()
+        return process.returncode, stdout, stderr
 
 
 async def compress_image(
@@ -61,12 +101,9 @@ async def compress_image(
                 "-y",
                 str(output_path),
             ]
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stderr=PIPE, stdout=PIPE
-            )
-            await process.communicate()
+            returncode, _, _ = await _run_ffmpeg(cmd)
 
-            if process.returncode == 0 and os.path.exists(output_path):
+            if returncode == 0 and os.path.exists(output_path):
                 return output_path
         except Exception as ffmpeg_err:
             logger.error(f"Error compressing image with ffmpeg: {ffmpeg_err}")
@@ -127,12 +164,9 @@ async def resize_image(
                 "-y",
                 str(output_path),
             ]
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stderr=PIPE, stdout=PIPE
-            )
-            await process.communicate()
+            returncode, _, _ = await _run_ffmpeg(cmd)
 
-            if process.returncode == 0 and os.path.exists(output_path):
+            if returncode == 0 and os.path.exists(output_path):
                 return output_path
         except Exception as ffmpeg_err:
             logger.error(f"Error resizing image with ffmpeg: {ffmpeg_err}")
@@ -184,6 +218,24 @@ async def fix_aspect_ratio(input_path: Path, output_path: Path) -> Path:
         return output_path
 
 
+def _read_video_info(video_path: str) -> tuple:
+    """Read (duration, width, height, fps) with OpenCV, runs in the media pool"""
+    video = cv2.VideoCapture(video_path)
+    if not video.isOpened():
+        raise RuntimeError(f"Failed to open video {video_path}")
+
+    try:
+        fps = video.get(cv2.CAP_PROP_FPS)
+        frame_count = video.get(cv2.CAP_PROP_FRAME_COUNT)
+        duration = int(frame_count / fps) if fps > 0 else 0
+        width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        video.release()
+
+    return duration, width, height, fps
+
+
 async def get_video_info(video_path: Path) -> tuple:
     """
     Get video information (duration, width, height)
@@ -195,18 +247,9 @@ async def get_video_info(video_path: Path) -> tuple:
         tuple: (duration, width, height)
     """
     try:
-        video = cv2.VideoCapture(str(video_path))
-        if not video.isOpened():
-            logger.error(f"Failed to open video {video_path}")
-            raise RuntimeError(f"Failed to open video {video_path}")
-
-        fps = video.get(cv2.CAP_PROP_FPS)
-        frame_count = video.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = int(frame_count / fps) if fps > 0 else 0
-        width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-        video.release()
+        duration, width, height, fps = await _run_in_pool(
+            _read_video_info, str(video_path)
+        )
 
         logger.info(
             f"Video info: duration={duration}s, dimensions={width}x{height}, fps={fps}"
@@ -229,12 +272,9 @@ async def get_video_info(video_path: Path) -> tuple:
                 str(video_path),
             ]
 
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=PIPE, stderr=PIPE
-            )
-            stdout, stderr = await process.communicate()
+            returncode, stdout, stderr = await _run_ffmpeg(cmd)
 
-            if process.returncode == 0:
+            if returncode == 0:
                 output = stdout.decode().strip().split(",")
                 if len(output) >= 3:
                     width = int(float(output[0]))
@@ -253,6 +293,33 @@ async def get_video_info(video_path: Path) -> tuple:
             return 0, 640, 480  # Default values
 
 
+def _write_thumbnail_frame(video_path: str, output_path: str) -> bool:
+    """Save the frame 1 second into a video with OpenCV, runs in the media pool"""
+    cap = cv2.VideoCapture(video_path)
+
+    # Check if video opened successfully
+    if not cap.isOpened():
+        logger.error(f"Failed to open video {video_path}")
+        return False
+
+    try:
+        # Move to 1 second in if possible
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps > 0:
+            target_frame = int(1 * fps)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
+
+        # Read frame
+        success, frame = cap.read()
+        if not success:
+            logger.error("Failed to read frame with OpenCV")
+            return False
+
+        return cv2.imwrite(output_path, frame)
+    finally:
+        cap.release()
+
+
 async def get_video_thumbnail(video_path: Path, output_path: Path) -> Path:
     """
     Extract thumbnail from a video while preserving aspect ratio
@@ -287,39 +354,20 @@ async def get_video_thumbnail(video_path: Path, output_path: Path) -> Path:
             str(output_path),
         ]
 
-        process = await asyncio.create_subprocess_exec(*cmd, stderr=PIPE, stdout=PIPE)
-        stdout, stderr = await process.communicate()
+        returncode, stdout, stderr = await _run_ffmpeg(cmd)
 
-        if process.returncode == 0 and os.path.exists(output_path):
+        if returncode == 0 and os.path.exists(output_path):
             logger.info(f"Successfully created thumbnail with ffmpeg: {output_path}")
             return output_path
 
         # If ffmpeg fails, try with OpenCV
         logger.info("Trying to extract thumbnail with OpenCV")
-        cap = cv2.VideoCapture(str(video_path))
-
-        # Check if video opened successfully
-        if not cap.isOpened():
-            logger.error(f"Failed to open video {video_path}")
-            return None
-
-        # Move to 1 second in if possible
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        if fps > 0:
-            target_frame = int(1 * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-
-        # Read frame
-        success, frame = cap.read()
-        if success:
-            cv2.imwrite(str(output_path), frame)
-            cap.release()
+        if await _run_in_pool(
+            _write_thumbnail_frame, str(video_path), str(output_path)
+        ):
             logger.info(f"Successfully created thumbnail with OpenCV: {output_path}")
             return output_path
-        else:
-            logger.error("Failed to read frame with OpenCV")
-            cap.release()
-            return None
+        return None
 
     except Exception as e:
         logger.error(f"Error getting video thumbnail: {e}")
@@ -498,6 +546,31 @@ async def resize_thumbnail(image_path: Path) -> Path:
             return None
 
 
+def _has_faststart(video_path: Path) -> bool:
+    """Check whether the moov atom of an MP4 file comes before mdat"""
+    with open(video_path, "rb") as f:
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return False
+
+            size = int.from_bytes(header[:4], "big")
+            box_type = header[4:]
+            if box_type == b"moov":
+                return True
+            if box_type == b"mdat" or size == 0:
+                return False
+
+            header_size = 8
+            if size == 1:
+                # 64-bit box size follows the header
+                size = int.from_bytes(f.read(8), "big")
+                header_size = 16
+            if size < header_size:
+                return False
+            f.seek(size - header_size, os.SEEK_CUR)
+
+
 async def move_metadata_to_start(video_path: Path):
     """
     Move metadata to start of video file for faster streaming
@@ -510,6 +583,10 @@ async def move_metadata_to_start(video_path: Path):
         return
 
     try:
+        # Most videos are already optimized, skip rewriting the whole file
+        if await asyncio.to_thread(_has_faststart, video_path):
+            return
+
         tmp_video_path = video_path.with_suffix(".tmp.mp4")
 
         cmd = [
@@ -524,10 +601,9 @@ async def move_metadata_to_start(video_path: Path):
             str(tmp_video_path),
         ]
 
-        process = await asyncio.create_subprocess_exec(*cmd, stderr=PIPE, stdout=PIPE)
-        stdout, stderr = await process.communicate()
+        returncode, stdout, stderr = await _run_ffmpeg(cmd)
 
-        if process.returncode == 0 and os.path.exists(tmp_video_path):
+        if returncode == 0 and os.path.exists(tmp_video_path):
             # Replace original with optimized version
             os.replace(str(tmp_video_path), str(video_path))
         else:
@@ -538,20 +614,8 @@ async def move_metadata_to_start(video_path: Path):
         logger.error(f"Error optimizing video: {e}")
 
 
-async def extract_frames(
-    video_path: Path, frames_count: int, output_folder: Path
-) -> list:
-    """
-    Extract frames from a video
-
-    Args:
-        video_path: Path to the video file
-        frames_count: Number of frames to extract
-        output_folder: Folder to save frames
-
-    Returns:
-        List of paths to extracted frames
-    """
+def _extract_frames(video_path: Path, frames_count: int, output_folder: Path) -> list:
+    """Extract frames with OpenCV, runs in the media pool"""
     try:
         # Ensure output folder exists
         os.makedirs(output_folder, exist_ok=True)
@@ -598,7 +662,7 @@ async def extract_frames(
             cv2.imwrite(str(frame_path), frame)
 
             # Add timestamp
-            await draw_time_on_image(frame_path, position_sec)
+            _draw_time_on_image(frame_path, position_sec)
 
             frame_paths.append(frame_path)
 
@@ -614,14 +678,31 @@ async def extract_frames(
         return []
 
 
-async def draw_time_on_image(image_path: Path, time_seconds: float):
+async def extract_frames(
+    video_path: Path, frames_count: int, output_folder: Path
+) -> list:
     """
-    Add timestamp to an image
+    Extract frames from a video
 
     Args:
-        image_path: Path to the image
-        time_seconds: Timestamp in seconds
+        video_path: Path to the video file
+        frames_count: Number of frames to extract
+        output_folder: Folder to save frames
+
+    Returns:
+        List of paths to extracted frames
     """
+    try:
+        return await _run_in_pool(
+            _extract_frames, video_path, frames_count, output_folder
+        )
+    except Exception as e:
+        logger.error(f"Error extracting frames: {e}")
+        return []
+
+
+def _draw_time_on_image(image_path: Path, time_seconds: float):
+    """Add timestamp to an image (blocking Pillow work)"""
     try:
         img = Image.open(image_path)
         draw = ImageDraw.Draw(img)
@@ -681,6 +762,50 @@ async def draw_time_on_image(image_path: Path, time_seconds: float):
         logger.error(f"Error drawing time on image: {e}")
 
 
+async def draw_time_on_image(image_path: Path, time_seconds: float):
+    """
+    Add timestamp to an image
+
+    Args:
+        image_path: Path to the image
+        time_seconds: Timestamp in seconds
+    """
+    await _run_in_pool(_draw_time_on_image, image_path, time_seconds)
+
+
+def _compose_thumb_grid(frame_paths: list, output_path: Path, grid_size: tuple):
+    """Paste frames into a grid image and save it, runs in the media pool"""
+    # Open the first image to get dimensions
+    with Image.open(frame_paths[0]) as first_img:
+        frame_width, frame_height = first_img.size
+
+    # Calculate grid dimensions
+    grid_width = grid_size[0] * frame_width
+    grid_height = grid_size[1] * frame_height
+
+    # Create grid image
+    grid_img = Image.new("RGB", (grid_width, grid_height))
+
+    # Paste images into grid
+    for index, frame_path in enumerate(frame_paths):
+        if index >= grid_size[0] * grid_size[1]:
+            break
+
+        try:
+            with Image.open(frame_path) as img:
+                x = (index % grid_size[0]) * frame_width
+                y = (index // grid_size[0]) * frame_height
+                grid_img.paste(img, (x, y))
+        except Exception as e:
+            logger.warning(f"Error processing frame {frame_path}: {e}")
+
+    # Ensure output directory exists
+    os.makedirs(output_path.parent, exist_ok=True)
+
+    # Save grid image
+    grid_img.save(output_path)
+
+
 async def create_thumb_grid(
     frames_folder: Path, frame_paths: list, output_path: Path, grid_size: tuple = (4, 4)
 ) -> Path:
@@ -702,42 +827,12 @@ async def create_thumb_grid(
             logger.error("No frames provided for grid creation")
             return None
 
-        # Open the first image to get dimensions
-        first_img = Image.open(frame_paths[0])
-        frame_width, frame_height = first_img.size
-
-        # Calculate grid dimensions
-        grid_width = grid_size[0] * frame_width
-        grid_height = grid_size[1] * frame_height
-
-        # Create grid image
-        grid_img = Image.new("RGB", (grid_width, grid_height))
-
-        # Paste images into grid
-        for index, frame_path in enumerate(frame_paths):
-            if index >= grid_size[0] * grid_size[1]:
-                break
-
-            try:
-                img = Image.open(frame_path)
-                x = (index % grid_size[0]) * frame_width
-                y = (index // grid_size[0]) * frame_height
-                grid_img.paste(img, (x, y))
-            except Exception as e:
-                logger.warning(f"Error processing frame {frame_path}: {e}")
-
-        # Ensure output directory exists
-        os.makedirs(output_path.parent, exist_ok=True)
-
-        # Save grid image
-        grid_img.save(output_path)
+        await _run_in_pool(_compose_thumb_grid, frame_paths, output_path, grid_size)
         logger.info(f"Created thumbnail grid at {output_path}")
 
         # Clean up frames folder
         try:
-            import shutil
-
-            shutil.rmtree(frames_folder)
+            await asyncio.to_thread(rmtree, frames_folder)
         except Exception as e:
             logger.warning(f"Failed to clean up frames folder: {e}")
 
@@ -763,7 +858,6 @@ async def process_video_thumb(
         Path to the thumbnail grid
     """
     try:
-        settings = Settings()
         # Create folder for frames
         frames_folder = settings.THUMBS_DIR / video_path.stem
 
@@ -1,13 +1,44 @@
-from collections import defaultdict
 from typing import List
 
 from pyrogram import Client, enums
 from pyrogram.types import Message
 
 from hypersave.database.models import User
-from hypersave.database.user_repository import UserRepository
-
-user_repository = UserRepository()
+from hypersave.database.user_repository import get_user_repository
+
+user_repository = get_user_repository()
+
+# Define priority for entities (some should override others)
+ENTITY_PRIORITY = {
+    enums.MessageEntityType.BOLD: 1,
+    enums.MessageEntityType.ITALIC: 2,
+    enums.MessageEntityType.UNDERLINE: 3,
+    enums.MessageEntityType.STRIKETHROUGH: 4,
+    enums.MessageEntityType.SPOILER: 5,
+    enums.MessageEntityType.CODE: 6,
+    enums.MessageEntityType.PRE: 7,
+    enums.MessageEntityType.TEXT_LINK: 8,
+    enums.MessageEntityType.HASHTAG: 9,
+}
+DEFAULT_ENTITY_PRIORITY = 100
+
+# Opening/closing markers for each entity type
+ENTITY_MARKERS = {
+    enums.MessageEntityType.BOLD: ("**", "**"),
+    enums.MessageEntityType.ITALIC: ("__", "__"),
+    enums.MessageEntityType.UNDERLINE: ("--", "--"),
+    enums.MessageEntityType.STRIKETHROUGH: ("~~", "~~"),
+    enums.MessageEntityType.SPOILER: ("||", "||"),
+    enums.MessageEntityType.CODE: ("`", "`"),
+    enums.MessageEntityType.PRE: ("```", "```"),
+}
+NO_MARKERS = ("", "")
+
+
+def _entity_markers(entity) -> tuple:
+    if entity.type == enums.MessageEntityType.TEXT_LINK:
+        return "[", f"]({entity.url})"
+    return ENTITY_MARKERS.get(entity.type, NO_MARKERS)
 
 
 async def save_message_info(message: Message):
@@ -23,7 +54,7 @@ async def process_private_message(message):
     user_repository.add(user)
 
 
-async def format_message_entities(message_text: str, entities: List = None) -> str:
+def format_message_entities(message_text: str, entities: List = None) -> str:
     """
     Format message text with entities (bold, italic, etc)
 
@@ -37,71 +68,36 @@ async def format_message_entities(message_text: str, entities: List = None) -> s
     if not message_text or not entities:
         return message_text
 
-    # Define priority for entities (some should override others)
-    priority = {
-        enums.MessageEntityType.BOLD: 1,
-        enums.MessageEntityType.ITALIC: 2,
-        enums.MessageEntityType.UNDERLINE: 3,
-        enums.MessageEntityType.STRIKETHROUGH: 4,
-        enums.MessageEntityType.SPOILER: 5,
-        enums.MessageEntityType.CODE: 6,
-        enums.MessageEntityType.PRE: 7,
-        enums.MessageEntityType.TEXT_LINK: 8,
-        enums.MessageEntityType.HASHTAG: 9,
-    }
-    default_priority = 100
-
-    # Group entities by position
-    entity_dict = defaultdict(list)
+    # Turn every entity into an opening and a closing marker event.
+    # At the same position closings come before openings; closings of inner
+    # entities (started later / higher priority) come first and openings of
+    # outer entities (ending later / lower priority) come first, so markers
+    # always nest properly.
+    events = []
     for entity in entities:
+        opening, closing = _entity_markers(entity)
+        if not opening or entity.length <= 0:
+            continue
+
         start = entity.offset
-        end = entity.offset + entity.length
-        entity_dict[(start, end)].append(entity)
+        end = start + entity.length
+        priority = ENTITY_PRIORITY.get(entity.type, DEFAULT_ENTITY_PRIORITY)
+        events.append((start, 1, -end, priority, opening))
+        events.append((end, 0, -start, -priority, closing))
 
-    # Build formatted text
-    last_end = 0
-    result = []
+    events.sort(key=lambda event: event[:4])
 
-    for (start, end), entities_at_pos in sorted(entity_dict.items()):
-        # Add any text before this entity
-        if start > last_end:
-            result.append(message_text[last_end:start])
-
-        # Get text for this entity
-        formatted_text = message_text[start:end]
-
-        # Sort entities by priority
-        entities_at_pos.sort(
-            key=lambda x: priority.get(x.type, default_priority), reverse=True
-        )
-
-        # Apply formatting for each entity
-        for entity in entities_at_pos:
-            if entity.type == enums.MessageEntityType.BOLD:
-                formatted_text = f"**{formatted_text}**"
-            elif entity.type == enums.MessageEntityType.ITALIC:
-                formatted_text = f"__{formatted_text}__"
-            elif entity.type == enums.MessageEntityType.UNDERLINE:
-                formatted_text = f"--{formatted_text}--"
-            elif entity.type == enums.MessageEntityType.STRIKETHROUGH:
-                formatted_text = f"~~{formatted_text}~~"
-            elif entity.type == enums.MessageEntityType.SPOILER:
-                formatted_text = f"||{formatted_text}||"
-            elif entity.type == enums.MessageEntityType.CODE:
-                formatted_text = f"`{formatted_text}`"
-            elif entity.type == enums.MessageEntityType.PRE:
-                formatted_text = f"```{formatted_text}```"
-            elif entity.type == enums.MessageEntityType.TEXT_LINK:
-                formatted_text = f"[{formatted_text}]({entity.url})"
-            elif entity.type == enums.MessageEntityType.HASHTAG:
-                formatted_text = f"{formatted_text}"
-
-        # Add formatted text to result
-        result.append(formatted_text)
-        last_end = end
+    # Sweep the text once, emitting slices and markers
+    last_pos = 0
+    result = []
+    for pos, _, _, _, marker in events:
+        if pos > last_pos:
+            result.append(message_text[last_pos:pos])
+            last_pos = pos
+        result.append(marker)
 
     # Add any remaining text
-    if last_end < len(message_text):
-        result.append(message_text[last_end:])
+    if last_pos < len(message_text):
+        result.append(message_text[last_pos:])
 
     return "".join(result)
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Optional, Set
+
+from pyrogram.types import Message
+
+from hypersave.logger import logger
+
+# Seconds between two edits of the same status message
+STATUS_EDIT_INTERVAL = 0.5
+
+# Strong references to running flush tasks so they aren't garbage collected
+_flush_tasks: Set[asyncio.Task] = set()
+
+
+class StatusUpdater:
+    """Coalescing editor for a status message
+
+    set() only records the text. A background task edits the message with
+    the latest text at most once every STATUS_EDIT_INTERVAL seconds and
+    skips texts that are already shown, so callers never wait on Telegram.
+    """
+
+    def __init__(self, message: Message, last_text: str = ""):
+        self.message = message
+        self.last_text = last_text
+        self._pending: Optional[str] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def set(self, text: str):
+        """Show text in the status message as soon as the interval allows"""
+        self._pending = text
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            _flush_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(_flush_tasks.discard)
+
+    async def flush(self):
+        """Wait until the latest text has been sent"""
+        if self._flush_task:
+            await self._flush_task
+
+    async def _flush_loop(self):
+        while self._pending is not None:
+            text, self._pending = self._pending, None
+            if text == self.last_text:
+                continue
+
+            try:
+                await self.message.edit_text(text)
+                self.last_text = text
+            except Exception as e:
+                if "MESSAGE_NOT_MODIFIED" not in str(e):
+                    logger.error("Error updating status message: {}", e)
+
+            await asyncio.sleep(STATUS_EDIT_INTERVAL)